@@ -8,6 +8,7 @@ class Settings(BaseSettings):
     APP_VERSION: str = "1.0.0"
     ENVIRONMENT: str = "development"
     DEBUG: bool = True
+    METRICS_TOKEN: str = ""  # bearer token for /metrics and /health/pools; required outside development
 
     # MongoDB
     MONGODB_URI: str = "mongodb://localhost:27017"
@@ -17,13 +18,75 @@ class Settings(BaseSettings):
     JWT_SECRET: str = "changeme-super-secret-key"
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRE_HOURS: int = 24
+    PRINCIPAL_CACHE_SIZE: int = 10000  # users kept in the per-process auth cache
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0  # bounds staleness across workers
+    BCRYPT_ROUNDS: int = 12  # changing it rehashes each password at next login
+    PASSWORD_HASH_WORKERS: int = 2  # threads; each bcrypt call occupies one core
+    PASSWORD_HASH_QUEUE_SIZE: int = 64  # waiting logins beyond this get a 503
 
     # GitHub
     GITHUB_TOKEN: str = ""
+    GITHUB_MAX_CONNECTIONS: int = 10
+    GITHUB_MAX_KEEPALIVE: int = 5
+    GITHUB_READ_TIMEOUT: float = 15.0
+    GITHUB_MAX_REPO_PAGES: int = 10  # 100 repos per page
 
     # Cerebras LLM
     CEREBRAS_API_KEY: str = ""
     CEREBRAS_MODEL: str = "llama-3.3-70b"
+    CEREBRAS_MAX_CONNECTIONS: int = 32
+    CEREBRAS_MAX_KEEPALIVE: int = 16
+    CEREBRAS_READ_TIMEOUT: float = 60.0
+    LLM_CACHE_SIZE: int = 1024  # in-process LRU entries
+    LLM_CACHE_TTL_DAYS: int = 7
+    PROMPT_RESUME_TOKEN_BUDGET: int = 700  # estimated tokens of resume text per prompt
+    PROMPT_JOB_TOKEN_BUDGET: int = 300
+    LLM_CONTEXT_TOKENS: int = 8192  # model context window, prompt + completion
+    LLM_MAX_JOBS_PER_CALL: int = 8  # multi-job scoring
+    LLM_OUTPUT_TOKENS_PER_JOB: int = 400
+    LLM_MIN_CONCURRENCY: int = 2  # adaptive (AIMD) limit on in-flight calls
+    LLM_MAX_CONCURRENCY: int = 32
+    LLM_INITIAL_CONCURRENCY: int = 8
+    LLM_LATENCY_TARGET_SECONDS: float = 20.0  # slower calls count as congestion
+    LLM_MAX_RETRIES: int = 3
+    LLM_RETRY_BASE_SECONDS: float = 0.5
+    LLM_RETRY_MAX_SECONDS: float = 20.0
+    LLM_BREAKER_FAILURES: int = 5  # consecutive failed attempts before failing fast
+    LLM_BREAKER_RESET_SECONDS: float = 30.0
+
+    # Shared upstream HTTP clients
+    HTTP2_ENABLED: bool = True  # used only when the h2 package is installed
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_POOL_TIMEOUT: float = 10.0  # max wait for a free pooled connection
+    HTTP_KEEPALIVE_EXPIRY: float = 60.0
+
+    # Resume parsing
+    PARSE_WORKERS: int = 2
+    PARSE_QUEUE_SIZE: int = 16
+    PARSE_TIMEOUT_SECONDS: float = 30.0
+    PARSE_IN_BACKGROUND: bool = False  # return 202 + "pending" and parse later
+    PDF_MAX_PAGES: int = 20  # pages beyond this are ignored
+    PDF_PAGES_PER_WORKER: int = 8  # longer PDFs are split across workers
+    PARSE_CACHE_SIZE: int = 256  # in-process LRU entries
+    PARSE_CACHE_TTL_DAYS: int = 30
+
+    # Bulk ingestion
+    BULK_MAX_FILES: int = 500
+    BULK_MAX_ARCHIVE_SIZE: int = 200 * 1024 * 1024
+    BULK_MAX_REQUEST_SIZE: int = 500 * 1024 * 1024  # whole /resumes/bulk body
+    BULK_CONCURRENCY: int = 8  # files held in memory / in flight at once
+    BULK_INSERT_BATCH: int = 50
+
+    # ATS scoring queue
+    SCORE_WORKERS: int = 4
+    SCORE_JOB_LEASE_SECONDS: int = 120
+    SCORE_JOB_MAX_ATTEMPTS: int = 3
+    SCORE_JOB_RETRY_BASE_SECONDS: float = 5.0
+    SCORE_QUEUE_POLL_SECONDS: float = 2.0
+    BATCH_SCORE_MAX_RESUMES: int = 500
+    BATCH_SCORE_CONCURRENCY: int = 16  # concurrent LLM calls per batch request
+    MULTI_SCORE_MAX_JOBS: int = 50  # jobs per /score/multi request
+    PRERANK_MAX_RESUMES: int = 10000
 
     # CORS
     CORS_ORIGINS: list[str] = [
@@ -1,19 +1,62 @@
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+
 from app.config import settings
+from app.utils.metrics import MONGO_FAILURES, MONGO_LATENCY
 
 client: AsyncIOMotorClient = None
 db = None
 
 
+class CommandTimer(monitoring.CommandListener):
+    """Feeds driver-reported command durations into the metrics histograms."""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        MONGO_LATENCY.observe(event.duration_micros / 1e6, event.command_name)
+
+    def failed(self, event):
+        MONGO_LATENCY.observe(event.duration_micros / 1e6, event.command_name)
+        MONGO_FAILURES.inc(event.command_name)
+
+
 async def connect_db():
     global client, db
-    client = AsyncIOMotorClient(settings.MONGODB_URI)
+    client = AsyncIOMotorClient(settings.MONGODB_URI, event_listeners=[CommandTimer()])
     db = client[settings.MONGODB_DB]
     # Create indexes
     await db.users.create_index("email", unique=True)
     await db.resumes.create_index("user_id")
+    await db.resumes.create_index([("user_id", 1), ("content_hash", 1)])
+    await db.resumes.create_index("skills")  # multikey, backs the skill index
+    await db.jobs.create_index([("status", 1), ("required_skills", 1)])
+    # Job search: equality filters first, then the (posted_at, _id) keyset
+    await db.jobs.create_index([("status", 1), ("posted_at", -1), ("_id", -1)])
+    await db.jobs.create_index(
+        [("status", 1), ("location_key", 1), ("posted_at", -1), ("_id", -1)]
+    )
+    await db.jobs.create_index(
+        [("status", 1), ("skill_keys", 1), ("posted_at", -1), ("_id", -1)]
+    )
+    await db.jobs.create_index(
+        [("status", 1), ("title", "text"), ("company", "text"), ("description", "text")],
+        weights={"title": 10, "company": 5, "description": 1},
+        name="job_search_text",
+    )
     await db.ats_scores.create_index([("resume_id", 1), ("job_id", 1)])
+    await db.ats_scores.create_index([("user_id", 1), ("created_at", -1), ("_id", -1)])
     await db.github_analysis.create_index("username", unique=True)
+    await db.score_jobs.create_index([("status", 1), ("run_after", 1)])
+    await db.score_jobs.create_index([("status", 1), ("lease_until", 1)])
+    await db.score_jobs.create_index("finished_at", expireAfterSeconds=7 * 86400)
+    await db.llm_cache.create_index(
+        "created_at", expireAfterSeconds=settings.LLM_CACHE_TTL_DAYS * 86400
+    )
+    await db.parse_cache.create_index(
+        "created_at", expireAfterSeconds=settings.PARSE_CACHE_TTL_DAYS * 86400
+    )
     print(f"Connected to MongoDB: {settings.MONGODB_DB}")
 
 
@@ -1,16 +1,36 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
 
 from app.config import settings
 from app.database import connect_db, close_db
+from app.services import http_clients, parse_pool, password_pool, resilience
+from app.services.auth import require_metrics_token
+from app.services.job_search import backfill_search_keys
+from app.services.search_index import start_search_indexes, stop_search_indexes
+from app.services.parse_pool import start_parse_pool, stop_parse_pool
+from app.services.score_queue import start_score_workers, stop_score_workers
+from app.utils import metrics
+from app.utils.singleflight import coalescing_stats
 from app.routers import auth, resumes, jobs, analysis, ats
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await connect_db()
+    await backfill_search_keys()
+    await start_search_indexes()
+    http_clients.start_http_clients()
+    start_parse_pool()
+    password_pool.start_password_pool()
+    start_score_workers()
     yield
+    await stop_score_workers()
+    password_pool.stop_password_pool()
+    stop_parse_pool()
+    await http_clients.close_http_clients()
+    await stop_search_indexes()
     await close_db()
 
 
@@ -46,3 +66,26 @@ async def health_check():
         "version": settings.APP_VERSION,
         "environment": settings.ENVIRONMENT,
     }
+
+
+@app.get("/health/pools", tags=["Health"], dependencies=[Depends(require_metrics_token)])
+async def pool_health():
+    """Upstream connection pool and parse pool usage, for capacity sizing."""
+    return {
+        "http": http_clients.pool_stats(),
+        "parse": parse_pool.pool_stats(),
+        "passwords": password_pool.pool_stats(),
+        "coalescing": coalescing_stats(),
+        "llm": resilience.resilience_stats(),
+    }
+
+
+@app.get(
+    "/metrics",
+    tags=["Health"],
+    response_class=PlainTextResponse,
+    dependencies=[Depends(require_metrics_token)],
+)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -18,6 +18,7 @@ class ATSScoreBase(BaseModel):
 
 class ATSScoreInDB(ATSScoreBase):
     id: Optional[str] = Field(default=None, alias="_id")
+    user_id: Optional[str] = None  # resume owner, for the history index
     overall_score: float = 0.0
     breakdown: ScoreBreakdown = Field(default_factory=ScoreBreakdown)
     feedback: dict = {}
@@ -26,6 +27,7 @@ class ATSScoreInDB(ATSScoreBase):
     missing_skills: list[str] = []
     tokens_used: int = 0
     estimated_cost: float = 0.0
+    degraded: bool = False  # rule-based fallback while the LLM was unavailable
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
     class Config:
@@ -40,6 +42,7 @@ class ATSScorePublic(ATSScoreBase):
     suggestions: list[str]
     matched_skills: list[str]
     missing_skills: list[str]
+    degraded: bool = False
     created_at: datetime
 
     class Config:
@@ -49,3 +52,99 @@ class ATSScorePublic(ATSScoreBase):
 class ScoreRequest(BaseModel):
     resume_id: str
     job_id: str
+
+
+class BatchScoreRequest(BaseModel):
+    job_id: str
+    resume_ids: list[str]
+    force_refresh: bool = False
+
+
+class RankedScore(BaseModel):
+    rank: int
+    resume_id: str
+    score_id: str
+    overall_score: float
+    matched_skills: list[str]
+    missing_skills: list[str]
+    cached: bool
+    degraded: bool = False
+
+
+class BatchScoreResponse(BaseModel):
+    job_id: str
+    ranked: list[RankedScore]
+    failed: dict[str, str] = {}
+    tokens_used: int = 0
+    estimated_cost: float = 0.0
+
+
+class MultiJobScoreRequest(BaseModel):
+    resume_id: str
+    job_ids: list[str]
+    force_refresh: bool = False
+
+
+class JobMatch(BaseModel):
+    rank: int
+    job_id: str
+    title: str = ""
+    company: str = ""
+    score_id: str
+    overall_score: float
+    matched_skills: list[str]
+    missing_skills: list[str]
+    cached: bool
+    degraded: bool = False
+
+
+class MultiJobScoreResponse(BaseModel):
+    resume_id: str
+    ranked: list[JobMatch]
+    failed: dict[str, str] = {}
+    tokens_used: int = 0
+    estimated_cost: float = 0.0
+
+
+class PrerankRequest(BaseModel):
+    job_ids: list[str]
+    resume_ids: list[str]
+    top_k: int = Field(default=20, ge=1, le=500)
+
+
+class PrerankCandidate(BaseModel):
+    resume_id: str
+    coverage: float
+    rule_based_score: int
+    matched_skills: list[str]
+    missing_skills: list[str]
+
+
+class JobPrerank(BaseModel):
+    job_id: str
+    candidates: list[PrerankCandidate]
+
+
+class PrerankResponse(BaseModel):
+    jobs: list[JobPrerank]
+    resumes_ranked: int
+
+
+class ScoreHistoryItem(BaseModel):
+    id: str
+    resume_id: str
+    job_id: str
+    overall_score: float
+    degraded: bool = False
+    created_at: datetime
+
+
+class ScoreHistoryPage(BaseModel):
+    items: list[ScoreHistoryItem]
+    next_cursor: Optional[str] = None  # pass back as ?cursor= for the next page
+
+
+class ScoreHistorySummary(BaseModel):
+    count: int = 0
+    average_score: Optional[float] = None  # None until the first score
+    recent: list[ScoreHistoryItem] = []  # newest first
@@ -34,3 +34,22 @@ class JobPublic(JobBase):
 
     class Config:
         populate_by_name = True
+
+
+class JobSearchPage(BaseModel):
+    items: list[JobPublic]
+    next_cursor: Optional[str] = None  # pass back as ?cursor= for the next page
+
+
+class CandidateRecommendation(BaseModel):
+    resume_id: str
+    score: float  # skills: IDF-weighted share of the job's skills covered, 0-1; text: BM25
+    matched_skills: list[str]
+    missing_skills: list[str]
+
+
+class JobRecommendation(BaseModel):
+    job: JobPublic
+    score: float
+    matched_skills: list[str]
+    missing_skills: list[str]
@@ -4,7 +4,7 @@ from datetime import datetime, timedelta
 
 from app.database import get_db
 from app.services.auth import get_current_user
-from app.services.github_analyzer import fetch_github_profile
+from app.services.github_analyzer import refresh_github_analysis
 from app.services.link_extractor import extract_github_username
 
 router = APIRouter()
@@ -28,35 +28,23 @@ async def analyze_github(
         cache_age = datetime.utcnow() - cached.get("analyzed_at", datetime.min)
         if cache_age < timedelta(hours=24):
             cached["_id"] = str(cached["_id"])
+            cached.pop("etags", None)
             return cached
 
-    # Fetch and cache in background
-    result = await fetch_github_profile(username)
-    if "error" not in result:
-        result["analyzed_at"] = datetime.utcnow()
-        await db.github_analysis.update_one(
-            {"username": username},
-            {"$set": result},
-            upsert=True,
-        )
-
-    return result
+    # Stale or missing: revalidate against GitHub (conditional if cached)
+    return await refresh_github_analysis(username, cached)
 
 
 @router.get("/github/{username}")
 async def get_github_analysis(username: str, current_user=Depends(get_current_user)):
     """Get cached GitHub analysis."""
     db = get_db()
-    cached = await db.github_analysis.find_one({"username": username})
+    cached = await db.github_analysis.find_one({"username": username}, {"etags": 0})
     if not cached:
         # Fetch fresh
-        result = await fetch_github_profile(username)
+        result = await refresh_github_analysis(username)
         if "error" in result:
             raise HTTPException(status_code=404, detail=result["error"])
-        result["analyzed_at"] = datetime.utcnow()
-        await db.github_analysis.update_one(
-            {"username": username}, {"$set": result}, upsert=True
-        )
         return result
 
     cached["_id"] = str(cached["_id"])
@@ -85,7 +73,8 @@ async def analyze_resume_links(resume_id: str, current_user=Depends(get_current_
     if github_url:
         username = extract_github_username(github_url)
         if username:
-            gh_data = await fetch_github_profile(username)
+            cached = await db.github_analysis.find_one({"username": username})
+            gh_data = await refresh_github_analysis(username, cached)
             analysis_results["github"] = gh_data
             analysis_results["link_score"] = gh_data.get("github_score", 0)
 
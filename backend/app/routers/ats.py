@@ -1,20 +1,47 @@
-from fastapi import APIRouter, HTTPException, Depends
+import json
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
 from bson import ObjectId
-from datetime import datetime
 
 from app.database import get_db
-from app.models.ats_score import ATSScorePublic, ScoreRequest
-from app.services.auth import get_current_user
-from app.services.llm_service import score_resume_with_llm
+from app.config import settings
+from app.models.ats_score import (
+    ATSScorePublic,
+    BatchScoreRequest,
+    BatchScoreResponse,
+    MultiJobScoreRequest,
+    MultiJobScoreResponse,
+    PrerankRequest,
+    PrerankResponse,
+    ScoreHistoryItem,
+    ScoreHistoryPage,
+    ScoreHistorySummary,
+    ScoreRequest,
+)
+from app.services.auth import get_current_user, get_current_recruiter
+from app.services.score_queue import enqueue_score, get_job, public_job
+from app.services.scoring import (
+    cached_github_score,
+    find_fresh_score,
+    prerank,
+    score_and_store,
+    score_batch,
+    score_resume_for_jobs,
+    stream_score,
+    to_public,
+)
+from app.utils import keyset
 
 router = APIRouter()
 
+HISTORY_FIELDS = {"resume_id": 1, "job_id": 1, "overall_score": 1, "degraded": 1, "created_at": 1}
+SUMMARY_RECENT = 5  # latest scores returned with the history summary
 
-@router.post("/score", response_model=ATSScorePublic, status_code=201)
-async def score_resume(
-    request: ScoreRequest,
-    current_user=Depends(get_current_user),
-):
+
+async def _load_pair(request: ScoreRequest, current_user: dict) -> tuple[dict, dict]:
+    """Validate resume ownership and job existence for a scoring request."""
     db = get_db()
 
     # Validate resume ownership
@@ -39,78 +66,156 @@ async def score_resume(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
+    return resume, job
+
+
+@router.post("/score", response_model=ATSScorePublic, status_code=201)
+async def score_resume(
+    request: ScoreRequest,
+    current_user=Depends(get_current_user),
+):
+    resume, job = await _load_pair(request, current_user)
+
     # Check cache (7-day TTL)
-    from datetime import timedelta
-    existing = await db.ats_scores.find_one(
-        {"resume_id": request.resume_id, "job_id": request.job_id}
-    )
+    existing = await find_fresh_score(request.resume_id, request.job_id)
     if existing:
-        age = datetime.utcnow() - existing.get("created_at", datetime.min)
-        if age < timedelta(days=7):
-            existing["_id"] = str(existing["_id"])
-            return ATSScorePublic(
-                id=existing["_id"],
-                resume_id=existing["resume_id"],
-                job_id=existing["job_id"],
-                overall_score=existing["overall_score"],
-                breakdown=existing["breakdown"],
-                feedback=existing.get("feedback", {}),
-                suggestions=existing.get("suggestions", []),
-                matched_skills=existing.get("matched_skills", []),
-                missing_skills=existing.get("missing_skills", []),
-                created_at=existing["created_at"],
-            )
-
-    # Get GitHub score for blended scoring
-    github_score = None
-    links = resume.get("extracted_links", {})
-    gh_url = links.get("github")
-    if gh_url:
-        from app.services.link_extractor import extract_github_username
-        username = extract_github_username(gh_url)
-        if username:
-            cached_gh = await db.github_analysis.find_one({"username": username})
-            if cached_gh:
-                github_score = cached_gh.get("github_score")
-
-    # Score with LLM
-    llm_result = await score_resume_with_llm(
-        resume_text=resume.get("parsed_text", ""),
-        job_description=job.get("description", ""),
-        required_skills=job.get("required_skills", []),
-        github_score=github_score,
+        return to_public(existing)
+
+    # Score with LLM (blended with GitHub score when available) and persist
+    doc = await score_and_store(resume, job, await cached_github_score(resume))
+    return to_public(doc)
+
+
+@router.post("/score/stream")
+async def score_resume_stream(
+    request: ScoreRequest,
+    current_user=Depends(get_current_user),
+):
+    """Score as Server-Sent Events: score, skills, feedback, then done."""
+    resume, job = await _load_pair(request, current_user)
+
+    async def sse():
+        try:
+            async for event, data in stream_score(resume, job):
+                yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'detail': f'Scoring failed: {e}'})}\n\n"
+
+    return StreamingResponse(
+        sse(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
-    # Persist
-    doc = {
-        "resume_id": request.resume_id,
-        "job_id": request.job_id,
-        "overall_score": llm_result.get("overall_score", 0),
-        "breakdown": llm_result.get("breakdown", {}),
-        "feedback": llm_result.get("feedback", {}),
-        "suggestions": llm_result.get("suggestions", []),
-        "matched_skills": llm_result.get("matched_skills", []),
-        "missing_skills": llm_result.get("missing_skills", []),
-        "tokens_used": llm_result.get("tokens_used", 0),
-        "estimated_cost": llm_result.get("estimated_cost", 0.0),
-        "created_at": datetime.utcnow(),
-    }
-
-    result = await db.ats_scores.insert_one(doc)
-    doc["_id"] = str(result.inserted_id)
-
-    return ATSScorePublic(
-        id=doc["_id"],
-        resume_id=doc["resume_id"],
-        job_id=doc["job_id"],
-        overall_score=doc["overall_score"],
-        breakdown=doc["breakdown"],
-        feedback=doc["feedback"],
-        suggestions=doc["suggestions"],
-        matched_skills=doc["matched_skills"],
-        missing_skills=doc["missing_skills"],
-        created_at=doc["created_at"],
+
+@router.post("/score/batch", response_model=BatchScoreResponse)
+async def score_resumes_batch(
+    request: BatchScoreRequest,
+    current_user=Depends(get_current_recruiter),
+):
+    """Rank many applicants' resumes against one of the recruiter's jobs."""
+    if len(request.resume_ids) > settings.BATCH_SCORE_MAX_RESUMES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.BATCH_SCORE_MAX_RESUMES} resumes per batch",
+        )
+    try:
+        job_oid = ObjectId(request.job_id)
+        resume_oids = list({ObjectId(rid) for rid in request.resume_ids})
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid job or resume ID")
+
+    job = await get_db().jobs.find_one(
+        {"_id": job_oid, "recruiter_id": current_user["_id"]}
+    )
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found or unauthorized")
+
+    return await score_batch(job, resume_oids, request.force_refresh)
+
+
+@router.post("/score/prerank", response_model=PrerankResponse)
+async def prerank_resumes(
+    request: PrerankRequest,
+    current_user=Depends(get_current_recruiter),
+):
+    """Instant skill-coverage shortlist of resumes for each of the recruiter's jobs."""
+    if len(request.resume_ids) > settings.PRERANK_MAX_RESUMES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.PRERANK_MAX_RESUMES} resumes per request",
+        )
+    try:
+        job_oids = list({ObjectId(jid) for jid in request.job_ids})
+        resume_oids = list({ObjectId(rid) for rid in request.resume_ids})
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid job or resume ID")
+
+    jobs = [
+        job
+        async for job in get_db().jobs.find(
+            {"_id": {"$in": job_oids}, "recruiter_id": current_user["_id"]},
+            {"required_skills": 1},
+        )
+    ]
+    if len(jobs) != len(job_oids):
+        raise HTTPException(status_code=404, detail="Job not found or unauthorized")
+
+    return await prerank(jobs, resume_oids, request.top_k)
+
+
+@router.post("/score/multi", response_model=MultiJobScoreResponse)
+async def score_resume_multi(
+    request: MultiJobScoreRequest,
+    current_user=Depends(get_current_user),
+):
+    """Match one of the user's resumes against several jobs, best match first."""
+    if len(request.job_ids) > settings.MULTI_SCORE_MAX_JOBS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.MULTI_SCORE_MAX_JOBS} jobs per request",
+        )
+    try:
+        resume_oid = ObjectId(request.resume_id)
+        job_oids = list({ObjectId(jid) for jid in request.job_ids})
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid resume or job ID")
+
+    resume = await get_db().resumes.find_one(
+        {"_id": resume_oid, "user_id": current_user["_id"]}
     )
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+
+    return await score_resume_for_jobs(resume, job_oids, request.force_refresh)
+
+
+@router.post("/score/jobs", status_code=202)
+async def submit_score_job(
+    request: ScoreRequest,
+    current_user=Depends(get_current_user),
+):
+    """Queue a score and return immediately; poll /score/jobs/{id}."""
+    await _load_pair(request, current_user)
+    doc = await enqueue_score(request.resume_id, request.job_id, current_user["_id"])
+    return public_job(doc)
+
+
+@router.get("/score/jobs/{job_id}")
+async def get_score_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=30, description="Long-poll up to N seconds for completion"),
+    current_user=Depends(get_current_user),
+):
+    try:
+        job_oid = ObjectId(job_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid job ID")
+
+    doc = await get_job(job_oid, current_user["_id"], wait)
+    if not doc:
+        raise HTTPException(status_code=404, detail="Scoring job not found")
+    return public_job(doc)
 
 
 @router.get("/score/{score_id}", response_model=ATSScorePublic)
@@ -125,43 +230,96 @@ async def get_score(score_id: str, current_user=Depends(get_current_user)):
     if not doc:
         raise HTTPException(status_code=404, detail="Score not found")
 
-    doc["_id"] = str(doc["_id"])
-    return ATSScorePublic(
-        id=doc["_id"],
+    return to_public(doc)
+
+
+def _history_item(doc: dict) -> ScoreHistoryItem:
+    return ScoreHistoryItem(
+        id=str(doc["_id"]),
         resume_id=doc["resume_id"],
         job_id=doc["job_id"],
         overall_score=doc["overall_score"],
-        breakdown=doc["breakdown"],
-        feedback=doc.get("feedback", {}),
-        suggestions=doc.get("suggestions", []),
-        matched_skills=doc.get("matched_skills", []),
-        missing_skills=doc.get("missing_skills", []),
+        degraded=doc.get("degraded", False),
         created_at=doc["created_at"],
     )
 
 
-@router.get("/history")
-async def score_history(current_user=Depends(get_current_user)):
-    """Get all ATS scores for resumes owned by the current user."""
-    db = get_db()
-    # Get user's resume IDs
-    resume_ids = []
-    async for resume in db.resumes.find(
-        {"user_id": current_user["_id"]}, {"_id": 1}
-    ):
-        resume_ids.append(str(resume["_id"]))
-
-    scores = []
-    async for doc in db.ats_scores.find(
-        {"resume_id": {"$in": resume_ids}}
-    ).sort("created_at", -1):
-        doc["_id"] = str(doc["_id"])
-        scores.append({
-            "id": doc["_id"],
-            "resume_id": doc["resume_id"],
-            "job_id": doc["job_id"],
-            "overall_score": doc["overall_score"],
-            "created_at": doc["created_at"].isoformat(),
-        })
-
-    return scores
+@router.get("/history", response_model=ScoreHistoryPage)
+async def score_history(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    current_user=Depends(get_current_user),
+):
+    """ATS scores for resumes owned by the current user, newest first.
+
+    Pass ``next_cursor`` back as ``cursor`` for the next page.
+    """
+    query = {"user_id": current_user["_id"]}
+    if cursor:
+        try:
+            query.update(keyset.after(cursor, "created_at"))
+        except keyset.InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    docs = (
+        get_db().ats_scores.find(query, HISTORY_FIELDS)
+        .sort(keyset.sort_spec("created_at"))
+        .limit(limit + 1)
+    )
+    items, next_cursor = await keyset.fetch_page(docs, limit, "created_at")
+    return ScoreHistoryPage(
+        items=[_history_item(doc) for doc in items], next_cursor=next_cursor
+    )
+
+
+@router.get("/history/summary", response_model=ScoreHistorySummary)
+async def score_history_summary(current_user=Depends(get_current_user)):
+    """Count, average and latest scores for the current user's resumes.
+
+    One aggregate over the user_id index, so the dashboard never has to page
+    through the whole history.
+    """
+    pipeline = [
+        {"$match": {"user_id": current_user["_id"]}},
+        {"$sort": dict(keyset.sort_spec("created_at"))},
+        {"$facet": {
+            "totals": [{"$group": {
+                "_id": None,
+                "count": {"$sum": 1},
+                "average": {"$avg": "$overall_score"},
+            }}],
+            "recent": [{"$limit": SUMMARY_RECENT}, {"$project": HISTORY_FIELDS}],
+        }},
+    ]
+    result = await get_db().ats_scores.aggregate(pipeline).to_list(1)
+    facets = result[0] if result else {"totals": [], "recent": []}
+    totals = facets["totals"][0] if facets["totals"] else {}
+    return ScoreHistorySummary(
+        count=totals.get("count", 0),
+        average_score=totals.get("average"),
+        recent=[_history_item(doc) for doc in facets["recent"]],
+    )
+
+
+@router.get("/history/export")
+async def export_score_history(current_user=Depends(get_current_user)):
+    """Every score for the current user's resumes as NDJSON, newest first.
+
+    Documents are written out as the Mongo cursor yields them, so memory use
+    does not grow with the size of the history.
+    """
+    docs = (
+        get_db().ats_scores.find({"user_id": current_user["_id"]})
+        .sort(keyset.sort_spec("created_at"))
+        .batch_size(500)
+    )
+
+    async def ndjson():
+        async for doc in docs:
+            yield to_public(doc).model_dump_json() + "\n"
+
+    return StreamingResponse(
+        ndjson(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="score-history.ndjson"'},
+    )
@@ -9,11 +9,20 @@ from app.services.auth import (
     verify_password,
     create_access_token,
     get_current_user,
+    token_claims,
 )
+from app.services.password_pool import PasswordPoolSaturated
 
 router = APIRouter()
 
 
+async def _or_503(call):
+    try:
+        return await call
+    except PasswordPoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "2"})
+
+
 def serialize_user(user: dict) -> dict:
     user["_id"] = str(user["_id"])
     return user
@@ -30,14 +39,14 @@ async def register(user_data: UserCreate):
         "email": user_data.email,
         "full_name": user_data.full_name,
         "role": user_data.role,
-        "password_hash": hash_password(user_data.password),
+        "password_hash": await _or_503(hash_password(user_data.password)),
         "created_at": datetime.utcnow(),
         "is_active": True,
     }
     result = await db.users.insert_one(doc)
     doc["_id"] = str(result.inserted_id)
 
-    token = create_access_token({"sub": doc["_id"], "role": doc["role"]})
+    token = create_access_token(token_claims(doc))
     user_public = UserPublic(
         id=doc["_id"],
         email=doc["email"],
@@ -53,11 +62,21 @@ async def register(user_data: UserCreate):
 async def login(credentials: UserLogin):
     db = get_db()
     user = await db.users.find_one({"email": credentials.email})
-    if not user or not verify_password(credentials.password, user["password_hash"]):
+    if not user:
         raise HTTPException(status_code=401, detail="Invalid email or password")
+    valid, new_hash = await _or_503(
+        verify_password(credentials.password, user["password_hash"])
+    )
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid email or password")
+    if new_hash:
+        await db.users.update_one({"_id": user["_id"]}, {"$set": {"password_hash": new_hash}})
+
+    if not user.get("is_active", True):
+        raise HTTPException(status_code=403, detail="Account is disabled")
 
     user["_id"] = str(user["_id"])
-    token = create_access_token({"sub": user["_id"], "role": user["role"]})
+    token = create_access_token(token_claims(user))
     user_public = UserPublic(
         id=user["_id"],
         email=user["email"],
@@ -1,10 +1,17 @@
 from fastapi import APIRouter, HTTPException, Depends, Query
 from bson import ObjectId
 from datetime import datetime
+from typing import Optional
 
 from app.database import get_db
-from app.models.job import JobCreate, JobPublic
-from app.services.auth import get_current_user, get_current_recruiter
+from app.models.job import CandidateRecommendation, JobCreate, JobPublic, JobSearchPage
+from app.services.auth import get_current_recruiter, get_token_principal
+from app.services.job_search import search_jobs, search_keys
+from app.services.search_index import (
+    SearchIndexLoading, index_job, text_resumes_for_job, unindex_job,
+)
+from app.services.skill_index import top_resumes_for_job
+from app.utils.keyset import InvalidCursor
 
 router = APIRouter()
 
@@ -33,12 +40,14 @@ async def create_job(
     db = get_db()
     doc = {
         **job_data.model_dump(),
+        **search_keys(job_data.model_dump()),
         "recruiter_id": current_user["_id"],
         "status": "active",
         "posted_at": datetime.utcnow(),
     }
     result = await db.jobs.insert_one(doc)
     doc["_id"] = str(result.inserted_id)
+    index_job(doc["_id"], doc)
     return serialize_job(doc)
 
 
@@ -46,15 +55,43 @@ async def create_job(
 async def list_jobs(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, le=100),
-    _=Depends(get_current_user),
+    _=Depends(get_token_principal),
 ):
     db = get_db()
     cursor = db.jobs.find({"status": "active"}).skip(skip).limit(limit).sort("posted_at", -1)
     return [serialize_job(j) async for j in cursor]
 
 
+@router.get("/search", response_model=JobSearchPage)
+async def search_job_postings(
+    q: Optional[str] = Query(None, max_length=200),
+    location: Optional[str] = None,
+    skills: list[str] = Query([]),
+    max_experience: Optional[int] = Query(None, ge=0),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    _=Depends(get_token_principal),
+):
+    """Active jobs matching a text query and filters, newest first.
+
+    Pages are keyed on (posted_at, _id): pass ``next_cursor`` back as
+    ``cursor`` to continue. Without ``q`` every page costs the same
+    regardless of depth; with ``q`` each page sorts all text matches in
+    memory, so broad queries are slower on every page. ``location`` is
+    matched ignoring case and extra whitespace.
+    """
+    try:
+        items, next_cursor = await search_jobs(
+            limit, q=q, location=location, skills=skills,
+            max_experience=max_experience, cursor=cursor,
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return JobSearchPage(items=[serialize_job(j) for j in items], next_cursor=next_cursor)
+
+
 @router.get("/{job_id}", response_model=JobPublic)
-async def get_job(job_id: str, _=Depends(get_current_user)):
+async def get_job(job_id: str, _=Depends(get_token_principal)):
     db = get_db()
     try:
         obj_id = ObjectId(job_id)
@@ -67,6 +104,44 @@ async def get_job(job_id: str, _=Depends(get_current_user)):
     return serialize_job(j)
 
 
+@router.get("/{job_id}/candidates", response_model=list[CandidateRecommendation])
+async def recommend_candidates(
+    job_id: str,
+    k: int = Query(20, ge=1, le=200),
+    method: str = Query("skills", pattern="^(skills|text)$"),
+    current_user=Depends(get_current_recruiter),
+):
+    """Top-K resumes for one of the recruiter's jobs, by weighted skill overlap
+    or (``method=text``) by BM25 relevance of resume text to the job posting."""
+    db = get_db()
+    try:
+        obj_id = ObjectId(job_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid job ID")
+
+    j = await db.jobs.find_one(
+        {"_id": obj_id, "recruiter_id": current_user["_id"]},
+        {"title": 1, "description": 1, "required_skills": 1},
+    )
+    if not j:
+        raise HTTPException(status_code=404, detail="Job not found or unauthorized")
+
+    if method == "text":
+        try:
+            ranked = text_resumes_for_job(j, k)
+        except SearchIndexLoading:
+            raise HTTPException(status_code=503, detail="Text index is still loading")
+    else:
+        ranked = await top_resumes_for_job(j.get("required_skills", []), k)
+    return [
+        CandidateRecommendation(
+            resume_id=resume_id, score=round(score, 4),
+            matched_skills=matched, missing_skills=missing,
+        )
+        for resume_id, score, matched, missing in ranked
+    ]
+
+
 @router.put("/{job_id}", response_model=JobPublic)
 async def update_job(
     job_id: str,
@@ -81,11 +156,12 @@ async def update_job(
 
     result = await db.jobs.find_one_and_update(
         {"_id": obj_id, "recruiter_id": current_user["_id"]},
-        {"$set": job_data.model_dump()},
+        {"$set": {**job_data.model_dump(), **search_keys(job_data.model_dump())}},
         return_document=True,
     )
     if not result:
         raise HTTPException(status_code=404, detail="Job not found or unauthorized")
+    index_job(job_id, result)
     return serialize_job(result)
 
 
@@ -103,3 +179,4 @@ async def delete_job(job_id: str, current_user=Depends(get_current_recruiter)):
     )
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Job not found or unauthorized")
+    unindex_job(job_id)
@@ -1,11 +1,35 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Depends
+import asyncio
+import json
+
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from bson import ObjectId
 from datetime import datetime
 
+from app.config import settings
 from app.database import get_db
-from app.models.resume import ResumePublic
-from app.services.auth import get_current_user
-from app.services.resume_parser import parse_resume
+from app.models.job import JobRecommendation
+from app.models.resume import ExtractedLinks, ResumePublic
+from app.services.auth import get_current_user, get_current_recruiter
+from app.services.bulk_ingest import ingest_batch
+from app.routers.jobs import serialize_job
+from app.services.parse_cache import get_cached_parse, store_parse
+from app.services.parse_pool import (
+    ParsePoolSaturated,
+    ParseTimeout,
+    submit_parse,
+    wait_parse,
+)
+from app.services.search_index import (
+    SearchIndexLoading, index_resume, text_jobs_for_resume, unindex_resume,
+)
+from app.services.skill_index import top_jobs_for_resume
+from app.utils.uploads import (
+    BULK_UPLOAD_OPENAPI,
+    UPLOAD_OPENAPI,
+    receive_upload,
+    receive_uploads,
+)
 
 router = APIRouter()
 
@@ -18,40 +42,96 @@ def serialize_resume(r: dict) -> dict:
     return r
 
 
-@router.post("/upload", response_model=ResumePublic, status_code=201)
-async def upload_resume(
-    file: UploadFile = File(...),
-    current_user=Depends(get_current_user),
+async def _finish_parse(
+    resume_oid: ObjectId, pending: asyncio.Future, content_hash: str
 ):
-    # Validate file type
-    import os
-    ext = os.path.splitext(file.filename or "")[1].lower()
-    if ext not in ALLOWED_EXTENSIONS:
-        raise HTTPException(
-            status_code=400,
-            detail="Unsupported file type. Only PDF and DOCX are allowed.",
-        )
+    """Move a background upload from pending to parsed or failed."""
+    db = get_db()
+    try:
+        parsed = await wait_parse(pending)
+    except (ValueError, ParseTimeout) as e:
+        update = {"status": "failed", "error": str(e)}
+    except Exception as e:
+        update = {"status": "failed", "error": f"Unexpected parser error: {e}"}
+    else:
+        update = parsed
+        await store_parse(content_hash, parsed)
+    result = await db.resumes.update_one({"_id": resume_oid}, {"$set": update})
+    # Skip failures, and resumes deleted while they were being parsed
+    if result.matched_count and update.get("status") != "failed":
+        index_resume(str(resume_oid), update)
 
-    file_bytes = await file.read()
-    if len(file_bytes) > MAX_FILE_SIZE:
-        raise HTTPException(status_code=400, detail="File size exceeds 5MB limit.")
 
+@router.post(
+    "/upload",
+    response_model=ResumePublic,
+    status_code=201,
+    openapi_extra=UPLOAD_OPENAPI,
+)
+async def upload_resume(
+    request: Request,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    current_user=Depends(get_current_user),
+):
+    # Type, size and magic bytes are enforced while the body streams in
+    upload = await receive_upload(request, MAX_FILE_SIZE, ALLOWED_EXTENSIONS)
+    pending = None
     try:
-        parsed = parse_resume(file_bytes, file.filename or "resume")
-    except ValueError as e:
-        raise HTTPException(status_code=422, detail=str(e))
+        # Identical bytes were parsed before: reuse the result outright
+        cached = await get_cached_parse(upload.sha256)
+        if cached is None:
+            try:
+                pending = submit_parse(upload.parse_source(), upload.filename or "resume")
+            except ParsePoolSaturated as e:
+                raise HTTPException(
+                    status_code=503, detail=str(e), headers={"Retry-After": "5"}
+                )
+    finally:
+        # A large upload is read by the worker from disk: keep it until then
+        if pending is None:
+            upload.close()
+        else:
+            pending.add_done_callback(lambda _: upload.close())
 
     db = get_db()
     doc = {
         "user_id": current_user["_id"],
-        "filename": file.filename,
-        "file_size": len(file_bytes),
+        "filename": upload.filename,
+        "file_size": upload.size,
+        "content_hash": upload.sha256,
         "uploaded_at": datetime.utcnow(),
-        **parsed,
     }
-    result = await db.resumes.insert_one(doc)
-    doc["_id"] = str(result.inserted_id)
 
+    if cached is not None:
+        doc.update(cached)
+        result = await db.resumes.insert_one(doc)
+        doc["_id"] = str(result.inserted_id)
+    elif settings.PARSE_IN_BACKGROUND:
+        doc.update(
+            parsed_text="",
+            extracted_links=ExtractedLinks().model_dump(),
+            skills=[],
+            sections={},
+            status="pending",
+        )
+        result = await db.resumes.insert_one(doc)
+        doc["_id"] = str(result.inserted_id)
+        background_tasks.add_task(
+            _finish_parse, result.inserted_id, pending, upload.sha256
+        )
+        response.status_code = 202
+    else:
+        try:
+            parsed = await wait_parse(pending)
+        except (ValueError, ParseTimeout) as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        await store_parse(upload.sha256, parsed)
+        doc.update(parsed)
+        result = await db.resumes.insert_one(doc)
+        doc["_id"] = str(result.inserted_id)
+
+    index_resume(doc["_id"], doc)
     return ResumePublic(
         id=doc["_id"],
         user_id=doc["user_id"],
@@ -65,6 +145,27 @@ async def upload_resume(
     )
 
 
+@router.post("/bulk", openapi_extra=BULK_UPLOAD_OPENAPI)
+async def bulk_upload(request: Request, current_user=Depends(get_current_recruiter)):
+    """Ingest many resumes (files and/or ZIP archives), streaming NDJSON outcomes."""
+    uploads = await receive_uploads(
+        request,
+        MAX_FILE_SIZE,
+        ALLOWED_EXTENSIONS | {".zip"},
+        field_name="files",
+        max_files=settings.BULK_MAX_FILES,
+        strict=False,
+        archive_max_size=settings.BULK_MAX_ARCHIVE_SIZE,
+        max_total=settings.BULK_MAX_REQUEST_SIZE,
+    )
+
+    async def ndjson():
+        async for outcome in ingest_batch(uploads, current_user["_id"], MAX_FILE_SIZE):
+            yield json.dumps(outcome, default=str) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
 @router.get("/list", response_model=list[ResumePublic])
 async def list_resumes(current_user=Depends(get_current_user)):
     db = get_db()
@@ -118,6 +219,48 @@ async def get_resume(resume_id: str, current_user=Depends(get_current_user)):
     )
 
 
+@router.get("/{resume_id}/recommended-jobs", response_model=list[JobRecommendation])
+async def recommend_jobs(
+    resume_id: str,
+    k: int = Query(20, ge=1, le=100),
+    method: str = Query("skills", pattern="^(skills|text)$"),
+    current_user=Depends(get_current_user),
+):
+    """Top-K active jobs for one of the user's resumes, by weighted skill
+    overlap or (``method=text``) by BM25 relevance of job text to the resume."""
+    db = get_db()
+    try:
+        obj_id = ObjectId(resume_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid resume ID")
+
+    r = await db.resumes.find_one(
+        {"_id": obj_id, "user_id": current_user["_id"]}, {"skills": 1, "parsed_text": 1}
+    )
+    if not r:
+        raise HTTPException(status_code=404, detail="Resume not found")
+
+    if method == "text":
+        try:
+            ranked = text_jobs_for_resume(r, k)
+        except SearchIndexLoading:
+            raise HTTPException(status_code=503, detail="Text index is still loading")
+    else:
+        ranked = await top_jobs_for_resume(r.get("skills", []), k)
+    jobs = {
+        str(j["_id"]): j
+        async for j in db.jobs.find({"_id": {"$in": [ObjectId(jid) for jid, *_ in ranked]}})
+    }
+    return [
+        JobRecommendation(
+            job=serialize_job(jobs[job_id]), score=round(score, 4),
+            matched_skills=matched, missing_skills=missing,
+        )
+        for job_id, score, matched, missing in ranked
+        if job_id in jobs
+    ]
+
+
 @router.delete("/{resume_id}", status_code=204)
 async def delete_resume(resume_id: str, current_user=Depends(get_current_user)):
     db = get_db()
@@ -131,3 +274,6 @@ async def delete_resume(resume_id: str, current_user=Depends(get_current_user)):
     )
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Resume not found")
+    # History reads ats_scores by user_id alone, so scores go with their resume
+    await db.ats_scores.delete_many({"resume_id": resume_id})
+    unindex_resume(resume_id)
@@ -1,3 +1,6 @@
+import hmac
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
@@ -8,17 +11,33 @@ from bson import ObjectId
 
 from app.config import settings
 from app.database import get_db
+from app.services.password_pool import run_hashing
+from app.utils.metrics import CACHE_REQUESTS
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
 security = HTTPBearer()
+optional_bearer = HTTPBearer(auto_error=False)
 
+# user_id -> (expires_at, user doc). Per process: invalidate_principal only
+# reaches this worker, so the TTL bounds how long other workers can serve a
+# stale role or is_active flag.
+_principals: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
 
+async def hash_password(password: str) -> str:
+    return await run_hashing("hash", pwd_context.hash, password)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+
+async def verify_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, Optional[str]]:
+    """Check a password; on success also return a fresh hash if the stored
+    one was made with different parameters (e.g. BCRYPT_ROUNDS changed)."""
+    return await run_hashing(
+        "verify", pwd_context.verify_and_update, plain_password, hashed_password
+    )
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -26,7 +45,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     expire = datetime.utcnow() + (
         expires_delta or timedelta(hours=settings.JWT_EXPIRE_HOURS)
     )
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
     return jwt.encode(to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
 
 
@@ -44,24 +63,106 @@ def decode_token(token: str) -> dict:
         )
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-):
-    token = credentials.credentials
-    payload = decode_token(token)
+def token_claims(user: dict) -> dict:
+    """Claims for a user's access token. ``role`` and ``active`` describe the
+    user at issue time only; authorization always reads the user document."""
+    return {"sub": str(user["_id"]), "role": user["role"], "active": user.get("is_active", True)}
+
+
+def invalidate_principal(user_id: str):
+    """Drop this worker's cached copy of a user; call after changing it."""
+    _principals.pop(user_id, None)
+
+
+async def load_principal(user_id: str) -> Optional[dict]:
+    """User document by id, through a bounded TTL cache."""
+    now = time.monotonic()
+    entry = _principals.get(user_id)
+    if entry and entry[0] > now:
+        _principals.move_to_end(user_id)
+        CACHE_REQUESTS.inc("principals", "memory_hit")
+        return dict(entry[1])
+
+    CACHE_REQUESTS.inc("principals", "miss")
+    user = await get_db().users.find_one({"_id": ObjectId(user_id)})
+    if not user:
+        _principals.pop(user_id, None)
+        return None
+    user["_id"] = str(user["_id"])
+    _principals[user_id] = (now + settings.PRINCIPAL_CACHE_TTL_SECONDS, user)
+    _principals.move_to_end(user_id)
+    while len(_principals) > settings.PRINCIPAL_CACHE_SIZE:
+        _principals.popitem(last=False)
+    return dict(user)
+
+
+def _token_subject(credentials: HTTPAuthorizationCredentials) -> tuple[str, dict]:
+    payload = decode_token(credentials.credentials)
     user_id = payload.get("sub")
-    if not user_id:
+    if not user_id or not ObjectId.is_valid(user_id):
         raise HTTPException(status_code=401, detail="Invalid token payload")
+    return user_id, payload
 
-    db = get_db()
-    user = await db.users.find_one({"_id": ObjectId(user_id)})
+
+def _require_active(user: dict):
+    if not user.get("is_active", True):
+        raise HTTPException(status_code=403, detail="Account is disabled")
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+):
+    user_id, _ = _token_subject(credentials)
+    user = await load_principal(user_id)
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
-    user["_id"] = str(user["_id"])
+    _require_active(user)
     return user
 
 
+async def get_token_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+):
+    """Authenticate read-only routes that only need to know the caller is a
+    signed-in, active user.
+
+    Returns ``{"_id", "role", "is_active"}`` from the user document, read
+    through the principal cache; the token's own role/active claims are
+    never trusted, so a role change or deactivation reaches every worker
+    within PRINCIPAL_CACHE_TTL_SECONDS rather than the token's lifetime.
+    """
+    user_id, _ = _token_subject(credentials)
+    user = await load_principal(user_id)
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found")
+    principal = {"_id": user_id, "role": user["role"], "is_active": user.get("is_active", True)}
+    _require_active(principal)
+    return principal
+
+
 async def get_current_recruiter(user=Depends(get_current_user)):
     if user.get("role") != "recruiter":
         raise HTTPException(status_code=403, detail="Recruiter access required")
     return user
+
+
+def require_metrics_token(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_bearer),
+):
+    """Guard for operational endpoints (/metrics, /health/pools).
+
+    Scrapers send ``Authorization: Bearer <METRICS_TOKEN>``. Without a
+    configured token the endpoints are open in development only.
+    """
+    if not settings.METRICS_TOKEN:
+        if settings.ENVIRONMENT == "development":
+            return
+        raise HTTPException(status_code=403, detail="Set METRICS_TOKEN to enable this endpoint")
+    if credentials is None or not hmac.compare_digest(
+        credentials.credentials.encode(), settings.METRICS_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
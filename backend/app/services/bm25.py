@@ -0,0 +1,147 @@
+import math
+import re
+from array import array
+from collections import Counter
+from typing import Optional
+
+import numpy as np
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+STOPWORDS = frozenset(
+    """a about above after all also an and any are as at be been being but by can
+    could did do does during each etc for from had has have having he her his how
+    i if in into is it its just may me more most my no not of on or our out over
+    per she should so such than that the their them then there these they this
+    those through to under up us very was we were what when where which while who
+    will with within would you your""".split()
+)
+MAX_QUERY_TERMS = 64  # long queries (whole resumes) keep their highest-IDF terms
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-cased word tokens, keeping tech spellings like c++, c#, node.js."""
+    return [
+        t for t in _TOKEN.findall(text.lower())
+        if t not in STOPWORDS and (len(t) > 1 or t in ("c", "r"))
+    ]
+
+
+class BM25Index:
+    """Incremental Okapi BM25 over a growing set of documents.
+
+    Each term's postings are two typed arrays (document slot as int32, term
+    frequency as uint16), so the index costs ~6 bytes per (document, term)
+    pair and a query is a few vectorised NumPy operations per term.
+    Removing a document only tombstones its slot and adjusts the statistics;
+    the arrays are rebuilt once tombstones outnumber a quarter of the
+    live documents.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._term_ids: dict[str, int] = {}
+        self._post_slots: list[array] = []
+        self._post_tfs: list[array] = []
+        self._df: list[int] = []
+        self._ids: list[Optional[str]] = []
+        self._slots: dict[str, int] = {}
+        self._doc_terms: list[Optional[tuple[array, array]]] = []
+        self._doc_len = array("I")
+        self._alive = bytearray()
+        self._total_len = 0
+        self._dead = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def add(self, doc_id: str, text: str):
+        self.remove(doc_id)
+        counts = Counter(tokenize(text))
+        if not counts:
+            return
+        self._add_counts(doc_id, counts)
+
+    def _add_counts(self, doc_id: str, counts: dict):
+        slot = len(self._ids)
+        self._ids.append(doc_id)
+        self._slots[doc_id] = slot
+        term_ids, tfs = array("i"), array("H")
+        for term, tf in counts.items():
+            term_id = self._term_ids.get(term)
+            if term_id is None:
+                term_id = self._term_ids[term] = len(self._df)
+                self._post_slots.append(array("i"))
+                self._post_tfs.append(array("H"))
+                self._df.append(0)
+            tf = min(tf, 65535)
+            self._post_slots[term_id].append(slot)
+            self._post_tfs[term_id].append(tf)
+            self._df[term_id] += 1
+            term_ids.append(term_id)
+            tfs.append(tf)
+        length = sum(counts.values())
+        self._doc_terms.append((term_ids, tfs))
+        self._doc_len.append(length)
+        self._alive.append(1)
+        self._total_len += length
+
+    def remove(self, doc_id: str):
+        slot = self._slots.pop(doc_id, None)
+        if slot is None:
+            return
+        term_ids, _ = self._doc_terms[slot]
+        for term_id in term_ids:
+            self._df[term_id] -= 1
+        self._total_len -= self._doc_len[slot]
+        self._alive[slot] = 0
+        self._doc_terms[slot] = None
+        self._ids[slot] = None
+        self._dead += 1
+        if self._dead > max(len(self._slots) // 4, 1000):
+            self._compact()
+
+    def _compact(self):
+        """Rebuild postings without tombstoned slots."""
+        live = [
+            (doc_id, self._doc_terms[slot])
+            for doc_id, slot in sorted(self._slots.items(), key=lambda item: item[1])
+        ]
+        terms = {term_id: term for term, term_id in self._term_ids.items()}
+        self.__init__(self.k1, self.b)
+        for doc_id, (term_ids, tfs) in live:
+            self._add_counts(doc_id, {terms[t]: tf for t, tf in zip(term_ids, tfs)})
+
+    def idf(self, term_id: int) -> float:
+        df = self._df[term_id]
+        return math.log(1 + (len(self._slots) - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, k: int) -> list[tuple[str, float]]:
+        """Top ``k`` documents for ``query`` as ``(doc_id, bm25_score)``."""
+        if not self._slots:
+            return []
+        counts = Counter(tokenize(query))
+        terms = [
+            (self._term_ids[t], qtf) for t, qtf in counts.items()
+            if t in self._term_ids and self._df[self._term_ids[t]] > 0
+        ]
+        if not terms:
+            return []
+        terms.sort(key=lambda item: self.idf(item[0]), reverse=True)
+
+        avgdl = self._total_len / len(self._slots)
+        doc_len = np.frombuffer(self._doc_len, dtype=np.uint32)
+        scores = np.zeros(len(self._ids), dtype=np.float32)
+        for term_id, qtf in terms[:MAX_QUERY_TERMS]:
+            slots = np.frombuffer(self._post_slots[term_id], dtype=np.int32)
+            tf = np.frombuffer(self._post_tfs[term_id], dtype=np.uint16).astype(np.float32)
+            norm = self.k1 * (1 - self.b + self.b * doc_len[slots] / avgdl)
+            weight = self.idf(term_id) * (1 + math.log(qtf))
+            scores[slots] += weight * tf * (self.k1 + 1) / (tf + norm)
+        scores *= np.frombuffer(self._alive, dtype=np.uint8)
+
+        hits = np.flatnonzero(scores)
+        if len(hits) > k:
+            hits = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+        hits = hits[np.argsort(-scores[hits], kind="stable")]
+        return [(self._ids[slot], round(float(scores[slot]), 4)) for slot in hits]
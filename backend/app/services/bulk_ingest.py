@@ -0,0 +1,250 @@
+import asyncio
+import hashlib
+import os
+import zipfile
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+from typing import AsyncIterator, Callable, Iterator, Optional
+
+from pymongo.errors import BulkWriteError
+
+from app.config import settings
+from app.database import get_db
+from app.services.parse_cache import get_cached_parse, store_parse
+from app.services.parse_pool import (
+    ParsePoolSaturated,
+    ParseTimeout,
+    submit_parse,
+    wait_parse,
+)
+from app.services.search_index import index_resume
+from app.utils.uploads import SNIFF_BYTES, UploadSink, magic_matches
+
+RESUME_EXTENSIONS = {".pdf", ".docx", ".doc"}
+
+
+@dataclass
+class BulkItem:
+    filename: str
+    load: Optional[Callable[[], bytes]] = None
+    error: Optional[str] = None
+
+
+def _read_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo, max_size: int) -> bytes:
+    # Never trust the header's file_size alone: cap the decompressed read too
+    with archive.open(info) as member:
+        data = member.read(max_size + 1)
+    if len(data) > max_size:
+        raise ValueError(f"File size exceeds {max_size // (1024 * 1024)}MB limit.")
+    return data
+
+
+def _iter_items(uploads: list[UploadSink], max_size: int) -> Iterator[BulkItem]:
+    """Yield resume files lazily; archive members are only read when processed.
+
+    Blocking (archive I/O): ingest_batch advances it with asyncio.to_thread.
+    """
+    count = 0
+    for upload in uploads:
+        if upload.error:
+            yield BulkItem(upload.filename, error=upload.error)
+            continue
+        if upload.ext != ".zip":
+            count += 1
+            yield BulkItem(upload.filename, upload.read_bytes)
+            continue
+
+        try:
+            archive = zipfile.ZipFile(upload.file)
+        except zipfile.BadZipFile:
+            yield BulkItem(upload.filename, error="Not a valid ZIP archive.")
+            continue
+        for info in archive.infolist():
+            name = os.path.basename(info.filename)
+            if info.is_dir() or not name or name.startswith(".") or "__MACOSX" in info.filename:
+                continue
+            if count >= settings.BULK_MAX_FILES:
+                yield BulkItem(
+                    info.filename,
+                    error=f"Batch limit of {settings.BULK_MAX_FILES} files reached.",
+                )
+                return
+            count += 1
+            if os.path.splitext(name)[1].lower() not in RESUME_EXTENSIONS:
+                yield BulkItem(
+                    info.filename,
+                    error="Unsupported file type. Only PDF and DOCX are allowed.",
+                )
+            elif info.file_size > max_size:
+                yield BulkItem(
+                    info.filename,
+                    error=f"File size exceeds {max_size // (1024 * 1024)}MB limit.",
+                )
+            else:
+                yield BulkItem(info.filename, partial(_read_member, archive, info, max_size))
+
+
+async def _parse_with_backpressure(file_bytes: bytes, filename: str) -> dict:
+    """Wait for a pool slot instead of failing the file when the pool is full."""
+    delay = 0.05
+    while True:
+        try:
+            pending = submit_parse(file_bytes, filename)
+            break
+        except ParsePoolSaturated:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 1.0)
+    return await wait_parse(pending)
+
+
+async def _process(
+    item: BulkItem, user_id: str, seen: dict[str, asyncio.Future]
+) -> tuple[dict, Optional[dict]]:
+    """Load, check and parse one file.
+
+    ``seen`` maps each content hash in the batch to whether its first copy
+    parsed. A later copy waits for that answer and is only reported as a
+    duplicate if the first succeeded; otherwise it is tried on its own.
+    """
+    outcome = {"filename": item.filename}
+    if item.error:
+        return {**outcome, "status": "failed", "error": item.error}, None
+
+    claim = None
+    try:
+        file_bytes = await asyncio.to_thread(item.load)
+        ext = os.path.splitext(item.filename)[1].lower()
+        if not magic_matches(ext, file_bytes[:SNIFF_BYTES]):
+            raise ValueError(f"File content does not match its {ext} extension.")
+
+        content_hash = hashlib.sha256(file_bytes).hexdigest()
+        first = seen.get(content_hash)
+        if first is not None and await asyncio.shield(first):
+            return {**outcome, "status": "duplicate", "content_hash": content_hash}, None
+        claim = seen[content_hash] = asyncio.get_running_loop().create_future()
+
+        parsed = await get_cached_parse(content_hash)
+        if parsed is None:
+            parsed = await _parse_with_backpressure(file_bytes, item.filename)
+            await store_parse(content_hash, parsed)
+        claim.set_result(True)
+    except (ValueError, ParseTimeout, zipfile.BadZipFile) as e:
+        return {**outcome, "status": "failed", "error": str(e)}, None
+    except Exception as e:
+        return {**outcome, "status": "failed", "error": f"Unexpected parser error: {e}"}, None
+    finally:
+        if claim is not None and not claim.done():
+            claim.set_result(False)
+            if seen.get(content_hash) is claim:
+                del seen[content_hash]
+
+    doc = {
+        "user_id": user_id,
+        "filename": os.path.basename(item.filename),
+        "file_size": len(file_bytes),
+        "content_hash": content_hash,
+        "uploaded_at": datetime.utcnow(),
+        **parsed,
+    }
+    return {**outcome, "status": "parsed", "skills": parsed["skills"]}, doc
+
+
+async def _flush(batch: list[tuple[dict, dict]], user_id: str) -> list[dict]:
+    """Drop resumes the user already has, then insert the rest in one call."""
+    db = get_db()
+    hashes = [doc["content_hash"] for _, doc in batch]
+    existing = {
+        d["content_hash"]: str(d["_id"])
+        async for d in db.resumes.find(
+            {"user_id": user_id, "content_hash": {"$in": hashes}}, {"content_hash": 1}
+        )
+    }
+
+    to_insert = []
+    for outcome, doc in batch:
+        if doc["content_hash"] in existing:
+            outcome.update(status="duplicate", resume_id=existing[doc["content_hash"]])
+            outcome.pop("skills", None)
+        else:
+            to_insert.append((outcome, doc))
+
+    if to_insert:
+        # Unordered: one bad document does not stop the rest, so a
+        # BulkWriteError names exactly which indexes were not written
+        errors: dict[int, str] = {}
+        try:
+            await db.resumes.insert_many([doc for _, doc in to_insert], ordered=False)
+        except BulkWriteError as e:
+            errors = {err["index"]: err["errmsg"] for err in e.details.get("writeErrors", [])}
+        except Exception as e:
+            errors = {i: str(e) for i in range(len(to_insert))}
+        # insert_many sets each document's _id before sending it
+        for i, (outcome, doc) in enumerate(to_insert):
+            if i in errors:
+                outcome.update(status="failed", error=f"Database write failed: {errors[i]}")
+                outcome.pop("skills", None)
+            else:
+                outcome["resume_id"] = str(doc["_id"])
+                index_resume(outcome["resume_id"], doc)
+    return [outcome for outcome, _ in batch]
+
+
+async def ingest_batch(
+    uploads: list[UploadSink], user_id: str, max_file_size: int
+) -> AsyncIterator[dict]:
+    """Parse and store a batch of uploads, yielding one outcome per file.
+
+    At most BULK_CONCURRENCY files are held in memory at a time; parsed
+    documents are written BULK_INSERT_BATCH at a time.
+    """
+    results: asyncio.Queue = asyncio.Queue()
+    slots = asyncio.Semaphore(settings.BULK_CONCURRENCY)
+    seen: dict[str, asyncio.Future] = {}
+
+    # A slot is held until the consumer takes the result, so a slow client
+    # pauses parsing instead of letting finished documents pile up.
+    async def run(item: BulkItem):
+        results.put_nowait(await _process(item, user_id, seen))
+
+    async def produce():
+        tasks = []
+        # Opening an archive reads its central directory: step the iterator
+        # on a thread so a large ZIP does not stall the event loop
+        items = _iter_items(uploads, max_file_size)
+        try:
+            while (item := await asyncio.to_thread(next, items, None)) is not None:
+                await slots.acquire()
+                tasks.append(asyncio.create_task(run(item)))
+            await asyncio.gather(*tasks)
+        finally:
+            results.put_nowait(None)
+
+    producer = asyncio.create_task(produce())
+    summary: Counter = Counter()
+    batch: list[tuple[dict, dict]] = []
+    try:
+        while True:
+            entry = await results.get()
+            if entry is not None:
+                slots.release()
+                outcome, doc = entry
+                if doc is None:
+                    summary[outcome["status"]] += 1
+                    yield outcome
+                    continue
+                batch.append((outcome, doc))
+            if batch and (entry is None or len(batch) >= settings.BULK_INSERT_BATCH):
+                for outcome in await _flush(batch, user_id):
+                    summary[outcome["status"]] += 1
+                    yield outcome
+                batch = []
+            if entry is None:
+                break
+        await producer
+        yield {"summary": {"total": sum(summary.values()), **summary}}
+    finally:
+        producer.cancel()
+        for upload in uploads:
+            upload.close()
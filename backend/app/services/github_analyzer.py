@@ -1,48 +1,124 @@
 import asyncio
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Awaitable, Optional
 
 import httpx
 
 from app.config import settings
+from app.database import get_db
+from app.services.http_clients import get_github_client
+from app.utils.singleflight import SingleFlight
 
+_github_flight = SingleFlight("github")
 
-async def fetch_github_profile(username: str) -> dict:
-    """Fetch GitHub user profile + repos and compute scores."""
+
+REPOS_PER_PAGE = 100  # GitHub's maximum
+
+
+async def fetch_github_profile(
+    username: str,
+    client: Optional[httpx.AsyncClient] = None,
+    etags: Optional[dict] = None,
+) -> dict:
+    """Fetch GitHub user profile + repos and compute scores.
+
+    With ``etags`` from a previous analysis the requests are conditional;
+    if GitHub reports nothing changed the result is just
+    ``{"username": ..., "not_modified": True}``. Concurrent lookups of the
+    same username share one set of API calls.
+    """
+    # A conditional call may answer "not modified", which means nothing to a
+    # caller without a stored analysis, so the two kinds never share a call
+    key = f"{username.lower()}:{'conditional' if etags else 'full'}"
+    result, _ = await _github_flight.do(
+        key, lambda: _fetch_github_profile(username, client, etags or {})
+    )
+    # Callers add fields (analyzed_at, _id) before storing, so hand out copies
+    return dict(result)
+
+
+def _last_page(response: httpx.Response) -> int:
+    last = response.links.get("last", {}).get("url")
+    if not last:
+        return 1
+    try:
+        return int(httpx.URL(last).params.get("page", 1))
+    except ValueError:
+        return 1
+
+
+async def _fetch_github_profile(
+    username: str, client: Optional[httpx.AsyncClient], etags: dict
+) -> dict:
     headers = {}
     if settings.GITHUB_TOKEN:
         headers["Authorization"] = f"token {settings.GITHUB_TOKEN}"
     headers["Accept"] = "application/vnd.github.v3+json"
 
-    async with httpx.AsyncClient(timeout=15) as client:
-        # User profile
-        r_user = await client.get(
-            f"https://api.github.com/users/{username}", headers=headers
+    client = client or get_github_client()
+    repo_etags: list[str] = etags.get("repos", [])
+
+    async def get(path: str, etag: Optional[str] = None, **params) -> httpx.Response:
+        conditional = {**headers, "If-None-Match": etag} if etag else headers
+        return await client.get(path, params=params or None, headers=conditional)
+
+    def get_repos(page: int, conditional: bool = True) -> Awaitable[httpx.Response]:
+        etag = repo_etags[page - 1] if conditional and page <= len(repo_etags) else None
+        return get(
+            f"/users/{username}/repos", etag,
+            sort="updated", per_page=REPOS_PER_PAGE, page=page,
         )
-        if r_user.status_code == 404:
-            return {"error": "GitHub user not found", "username": username}
+
+    # Profile and first repo page together; the page tells us how many follow
+    r_user, first = await asyncio.gather(
+        get(f"/users/{username}", etags.get("user")), get_repos(1)
+    )
+    if r_user.status_code == 404:
+        return {"error": "GitHub user not found", "username": username}
+    if r_user.status_code not in (200, 304):
+        return {"error": f"GitHub API error: {r_user.status_code}", "username": username}
+
+    if first.status_code == 304:
+        pages = max(len(repo_etags), 1)
+    elif first.status_code == 200:
+        pages = _last_page(first)
+    else:
+        pages = 0
+    pages = min(pages, settings.GITHUB_MAX_REPO_PAGES)
+    responses = [first] if pages else []
+    responses += await asyncio.gather(*(get_repos(page) for page in range(2, pages + 1)))
+
+    if r_user.status_code == 304 and all(r.status_code == 304 for r in responses):
+        return {"username": username, "not_modified": True}
+
+    # Something changed: the aggregates need every body, so re-request the
+    # parts GitHub answered 304 for
+    if r_user.status_code == 304:
+        r_user = await get(f"/users/{username}")
         if r_user.status_code != 200:
             return {"error": f"GitHub API error: {r_user.status_code}", "username": username}
+    stale = [i for i, r in enumerate(responses) if r.status_code == 304]
+    for i, r in zip(stale, await asyncio.gather(*(get_repos(i + 1, False) for i in stale))):
+        responses[i] = r
 
-        user_data = r_user.json()
-
-        # Repositories
-        r_repos = await client.get(
-            f"https://api.github.com/users/{username}/repos",
-            params={"sort": "updated", "per_page": 30},
-            headers=headers,
-        )
-        repos = r_repos.json() if r_repos.status_code == 200 else []
+    user_data = r_user.json()
+    repos = [repo for r in responses if r.status_code == 200 for repo in r.json()]
+    new_etags = {
+        "user": r_user.headers.get("ETag"),
+        # One per page, by position; None where that page failed
+        "repos": [r.headers.get("ETag") if r.status_code == 200 else None for r in responses],
+    }
 
     # Aggregate languages
     language_counts: dict[str, int] = {}
     top_repos = []
 
-    for repo in repos[:10]:
+    for repo in repos:
         lang = repo.get("language")
         if lang:
             language_counts[lang] = language_counts.get(lang, 0) + 1
 
+    for repo in repos[:10]:
         top_repos.append(
             {
                 "name": repo.get("name"),
@@ -58,7 +134,7 @@ async def fetch_github_profile(username: str) -> dict:
     # Compute scores
     total_stars = sum(r.get("stargazers_count", 0) for r in repos)
     total_forks = sum(r.get("forks_count", 0) for r in repos)
-    repos_count = len(repos)
+    repos_count = user_data.get("public_repos", len(repos))
     has_bio = bool(user_data.get("bio"))
     has_location = bool(user_data.get("location"))
     followers = user_data.get("followers", 0)
@@ -98,4 +174,32 @@ async def fetch_github_profile(username: str) -> dict:
         "total_forks": total_forks,
         "github_score": github_score,
         "analyzed_at": datetime.utcnow().isoformat(),
+        "etags": new_etags,
     }
+
+
+async def refresh_github_analysis(username: str, cached: Optional[dict] = None) -> dict:
+    """Re-analyse ``username`` and store the result in github_analysis.
+
+    Requests are conditional on the ETags saved with ``cached`` (the stored
+    document, if any), so an unchanged profile costs only 304s, which GitHub
+    does not count against the rate limit; the stored analysis is then kept
+    and only its analyzed_at moves. Returns the analysis without the ETags,
+    or an ``{"error": ...}`` dict.
+    """
+    db = get_db()
+    result = await fetch_github_profile(username, etags=(cached or {}).get("etags"))
+    if result.get("not_modified"):
+        result = {**cached, "analyzed_at": datetime.utcnow()}
+        await db.github_analysis.update_one(
+            {"username": username}, {"$set": {"analyzed_at": result["analyzed_at"]}}
+        )
+    elif "error" not in result:
+        result["analyzed_at"] = datetime.utcnow()
+        await db.github_analysis.update_one(
+            {"username": username}, {"$set": result}, upsert=True
+        )
+    result.pop("etags", None)
+    if "_id" in result:
+        result["_id"] = str(result["_id"])
+    return result
@@ -0,0 +1,133 @@
+import importlib.util
+import time
+
+import httpx
+
+from app.config import settings
+from app.utils.metrics import UPSTREAM_LATENCY, UPSTREAM_RESPONSES
+
+CEREBRAS_BASE_URL = "https://api.cerebras.ai"
+GITHUB_BASE_URL = "https://api.github.com"
+
+_clients: dict[str, httpx.AsyncClient] = {}
+_requests_sent: dict[str, int] = {}
+_transports: dict[str, "_CountingTransport"] = {}
+
+
+class _CountingTransport(httpx.AsyncBaseTransport):
+    """Wraps the pooled transport to count requests still waiting on the
+    upstream (for a free connection or for response headers)."""
+
+    def __init__(self, transport: httpx.AsyncHTTPTransport, limits: httpx.Limits, http2: bool):
+        self._transport = transport
+        self.limits = limits
+        self.http2 = http2
+        self.in_flight = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        try:
+            return await self._transport.handle_async_request(request)
+        finally:
+            self.in_flight -= 1
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+def _http2_available() -> bool:
+    return settings.HTTP2_ENABLED and importlib.util.find_spec("h2") is not None
+
+
+def _build_client(
+    name: str, base_url: str, max_connections: int, max_keepalive: int, read_timeout: float
+) -> httpx.AsyncClient:
+    _requests_sent.setdefault(name, 0)
+
+    async def count_request(request: httpx.Request):
+        _requests_sent[name] += 1
+        request.extensions["sent_at"] = time.perf_counter()
+
+    async def record_response(response: httpx.Response):
+        sent_at = response.request.extensions.get("sent_at")
+        if sent_at is not None:
+            UPSTREAM_LATENCY.observe(time.perf_counter() - sent_at, name)
+        UPSTREAM_RESPONSES.inc(name, response.status_code)
+
+    http2 = _http2_available()
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+    )
+    transport = _transports[name] = _CountingTransport(
+        httpx.AsyncHTTPTransport(http2=http2, limits=limits), limits, http2
+    )
+    return httpx.AsyncClient(
+        base_url=base_url,
+        transport=transport,
+        timeout=httpx.Timeout(
+            read_timeout,
+            connect=settings.HTTP_CONNECT_TIMEOUT,
+            pool=settings.HTTP_POOL_TIMEOUT,
+        ),
+        event_hooks={"request": [count_request], "response": [record_response]},
+    )
+
+
+def get_cerebras_client() -> httpx.AsyncClient:
+    """Shared keep-alive client for Cerebras (created lazily outside the app)."""
+    client = _clients.get("cerebras")
+    if client is None or client.is_closed:
+        client = _clients["cerebras"] = _build_client(
+            "cerebras",
+            CEREBRAS_BASE_URL,
+            settings.CEREBRAS_MAX_CONNECTIONS,
+            settings.CEREBRAS_MAX_KEEPALIVE,
+            settings.CEREBRAS_READ_TIMEOUT,
+        )
+    return client
+
+
+def get_github_client() -> httpx.AsyncClient:
+    """Shared keep-alive client for the GitHub REST API."""
+    client = _clients.get("github")
+    if client is None or client.is_closed:
+        client = _clients["github"] = _build_client(
+            "github",
+            GITHUB_BASE_URL,
+            settings.GITHUB_MAX_CONNECTIONS,
+            settings.GITHUB_MAX_KEEPALIVE,
+            settings.GITHUB_READ_TIMEOUT,
+        )
+    return client
+
+
+def start_http_clients():
+    get_cerebras_client()
+    get_github_client()
+    print(f"HTTP client pools ready (http2={_http2_available()})")
+
+
+async def close_http_clients():
+    for client in _clients.values():
+        await client.aclose()
+    _clients.clear()
+
+
+def pool_stats() -> dict:
+    """Connection usage per upstream, for sizing the pool limits."""
+    stats = {}
+    for name in _clients:
+        transport = _transports[name]
+        stats[name] = {
+            "max_connections": transport.limits.max_connections,
+            "max_keepalive_connections": transport.limits.max_keepalive_connections,
+            # Waiting for a connection or for response headers; a request at
+            # max_connections with this still climbing means the pool is short
+            "in_flight": transport.in_flight,
+            "requests_sent": _requests_sent.get(name, 0),
+            "http2": transport.http2,
+        }
+    return stats
+
@@ -0,0 +1,88 @@
+from typing import Optional
+
+from pymongo import UpdateOne
+
+from app.database import get_db
+from app.services.skill_matrix import canonical_skill
+from app.utils.keyset import after, fetch_page, sort_spec
+
+
+def skill_keys(required_skills: list[str]) -> list[str]:
+    """Canonical, lower-cased skills stored next to the recruiter's spelling
+    so the skills filter is an exact multikey index match."""
+    return sorted({k for k in map(canonical_skill, required_skills) if k})
+
+
+def location_key(location: Optional[str]) -> Optional[str]:
+    """Case- and whitespace-insensitive form of a location, so "New York"
+    and " new  york" hit the same index entry."""
+    key = " ".join((location or "").split()).casefold()
+    return key or None
+
+
+def search_keys(job: dict) -> dict:
+    """Normalised filter fields stored next to a job's own values."""
+    return {
+        "skill_keys": skill_keys(job.get("required_skills") or []),
+        "location_key": location_key(job.get("location")),
+    }
+
+
+async def backfill_search_keys():
+    """Add the search_keys fields to jobs created before they existed."""
+    db = get_db()
+    ops = []
+    async for j in db.jobs.find(
+        {"$or": [{"skill_keys": {"$exists": False}}, {"location_key": {"$exists": False}}]},
+        {"required_skills": 1, "location": 1},
+    ):
+        ops.append(UpdateOne({"_id": j["_id"]}, {"$set": search_keys(j)}))
+        if len(ops) == 1000:
+            await db.jobs.bulk_write(ops, ordered=False)
+            ops = []
+    if ops:
+        await db.jobs.bulk_write(ops, ordered=False)
+
+
+def build_query(
+    q: Optional[str] = None,
+    location: Optional[str] = None,
+    skills: Optional[list[str]] = None,
+    max_experience: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> dict:
+    """Mongo filter for one page of active jobs, newest first.
+
+    Equality filters (status, location_key, skill_keys) lead so they line
+    up with the compound indexes in database.connect_db; the page boundary
+    is a keyset predicate on (posted_at, _id) rather than a skip.
+
+    With ``q`` the plan is driven by the text index instead, which cannot
+    return matches in (posted_at, _id) order: every page re-reads all text
+    matches and sorts them in memory, so its cost grows with the number of
+    matches (not with page depth).
+    """
+    query: dict = {"status": "active"}
+    if q:
+        query["$text"] = {"$search": q}
+    if location_key(location):
+        query["location_key"] = location_key(location)
+    keys = skill_keys(skills or [])
+    if keys:
+        query["skill_keys"] = {"$all": keys}
+    if max_experience is not None:
+        # Jobs with no stated requirement match too
+        query["experience_years"] = {"$not": {"$gt": max_experience}}
+    if cursor:
+        query.update(after(cursor, "posted_at"))
+    return query
+
+
+async def search_jobs(limit: int, **filters) -> tuple[list[dict], Optional[str]]:
+    """One page of matching jobs and the cursor for the next (None at the end)."""
+    cursor = (
+        get_db().jobs.find(build_query(**filters))
+        .sort(sort_spec("posted_at"))
+        .limit(limit + 1)
+    )
+    return await fetch_page(cursor, limit, "posted_at")
@@ -0,0 +1,59 @@
+import json
+from typing import Any
+
+
+class JSONObjectStream:
+    """Incrementally parse a streamed JSON object, one top-level member at a time.
+
+    ``feed`` accepts arbitrary text fragments and returns the ``(key, value)``
+    pairs whose values became complete in that fragment. Anything before the
+    opening brace (e.g. a model's preamble or a code fence) is ignored.
+    """
+
+    def __init__(self):
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._member: list[str] = []
+        self.done = False
+
+    def feed(self, text: str) -> list[tuple[str, Any]]:
+        members: list[tuple[str, Any]] = []
+        for ch in text:
+            if self.done:
+                break
+            if self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._close_member(members)
+                    self.done = True
+                    continue
+            elif ch == "," and self._depth == 1:
+                self._close_member(members)
+                continue
+
+            self._member.append(ch)
+        return members
+
+    def _close_member(self, members: list[tuple[str, Any]]):
+        raw = "".join(self._member).strip()
+        self._member = []
+        if not raw:
+            return
+        members.extend(json.loads("{" + raw + "}").items())
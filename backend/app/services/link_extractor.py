@@ -1,61 +1,138 @@
 import re
 from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
 from app.models.resume import ExtractedLinks
 
 
-# Regex patterns for link detection
-PATTERNS = {
-    "github": [
-        r"github\.com/([a-zA-Z0-9_-]+)(?:/[a-zA-Z0-9_\-\.]*)?",
-    ],
-    "linkedin": [
-        r"linkedin\.com/in/([a-zA-Z0-9_-]+)/?",
-    ],
-    "huggingface": [
-        r"huggingface\.co/([a-zA-Z0-9_-]+)/?",
-    ],
-    "leetcode": [
-        r"leetcode\.com/([a-zA-Z0-9_-]+)/?",
-    ],
-    "email": [
-        r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}",
-    ],
-    "phone": [
-        r"(?:\+?\d{1,3}[\s\-]?)?\(?\d{3}\)?[\s\-]?\d{3}[\s\-]?\d{4}",
-    ],
-    "portfolio": [
-        r"https?://(?:www\.)?(?!github\.com|linkedin\.com|huggingface\.co|leetcode\.com)[a-zA-Z0-9\-\.]+\.[a-zA-Z]{2,}(?:/[^\s]*)?",
-    ],
+# Profile hosts that are recognised even without a scheme, mapped to link type
+PROFILE_HOSTS = {
+    "github.com": "github",
+    "linkedin.com": "linkedin",
+    "huggingface.co": "huggingface",
+    "leetcode.com": "leetcode",
+}
+
+# Query parameters that only carry tracking state and never change the target
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "mc_cid", "mc_eid", "ref", "ref_src", "trk",
+    "trackingid", "lipi", "si", "igshid",
 }
 
+# Every quantifier below is bounded and adjacent pieces use disjoint character
+# classes, so a failed match costs O(1) per start position regardless of input.
+_HOST = r"(?:[a-zA-Z0-9](?:[a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?\.){1,8}[a-zA-Z]{2,24}"
+_PATH = r"(?:[/?#][^\s<>\"'`|\\\]\[{}]{0,2048})?"
+_PROFILE = "|".join(re.escape(h) for h in PROFILE_HOSTS)
+
+SCANNER = re.compile(
+    rf"""
+    (?P<email>(?<![\w.%+\-])[a-zA-Z0-9._%+\-]{{1,64}}@{_HOST}(?![\w\-]))
+    | (?P<url>(?:https?://(?:www\.)?|(?<![\w.@/])www\.){_HOST}(?::\d{{1,5}})?{_PATH})
+    | (?P<profile>(?<![\w.@/\-])(?:www\.)?(?:{_PROFILE}){_PATH})
+    | (?P<phone>(?<![\w+])(?:\+?\d{{1,3}}[\s.\-]?)?(?:\(\d{{3}}\)|\d{{3}})[\s.\-]?\d{{3}}[\s.\-]?\d{{4}}(?!\d))
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+_PROFILE_PATHS = {
+    "github": re.compile(r"^/([a-zA-Z0-9_-]+)"),
+    "linkedin": re.compile(r"^/in/([a-zA-Z0-9_%-]+)"),
+    "huggingface": re.compile(r"^/([a-zA-Z0-9_-]+)"),
+    "leetcode": re.compile(r"^/(?:u/)?([a-zA-Z0-9_-]+)$"),
+}
+
+
+def normalize_url(url: str) -> str:
+    """Canonicalise a URL: https scheme, lowercase host without www., no
+    tracking parameters, fragment or trailing slash."""
+    url = url.rstrip(".,;:!?)'\"")
+    if not re.match(r"^https?://", url, re.IGNORECASE):
+        url = "https://" + url
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(
+        [
+            (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+            if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+        ]
+    )
+    path = parts.path.rstrip("/")
+    return urlunsplit((parts.scheme.lower(), host, path, query, ""))
+
+
+def _profile_url(link_type: str, url: str) -> Optional[str]:
+    """Reduce a profile-host URL to the canonical profile link, if it has one."""
+    parts = urlsplit(url)
+    match = _PROFILE_PATHS[link_type].match(parts.path)
+    if not match:
+        return None
+    username = match.group(1)
+    if link_type == "linkedin":
+        return f"https://linkedin.com/in/{username}"
+    return f"https://{parts.netloc}/{username}"
+
 
 def extract_all_links(text: str) -> ExtractedLinks:
-    """Extract and categorize all links from text."""
+    """Extract, normalise, dedupe and categorize all links in a single scan."""
     links = ExtractedLinks()
-    other = []
-
-    for link_type, patterns_list in PATTERNS.items():
-        for pattern in patterns_list:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                match = matches[0]
-                # Reconstruct full URL for certain types
-                if link_type == "github":
-                    links.github = f"https://github.com/{match}"
-                elif link_type == "linkedin":
-                    links.linkedin = f"https://linkedin.com/in/{match}"
-                elif link_type == "huggingface":
-                    links.huggingface = f"https://huggingface.co/{match}"
-                elif link_type == "leetcode":
-                    links.leetcode = f"https://leetcode.com/{match}"
-                elif link_type == "email":
-                    links.email = match
-                elif link_type == "phone":
-                    links.phone = match
-                elif link_type == "portfolio":
-                    links.portfolio = match
-                break
+    other: list[str] = []
+    seen: set[str] = set()
+
+    def add_other(value: str) -> None:
+        if value.lower() not in seen:
+            seen.add(value.lower())
+            other.append(value)
+
+    for m in SCANNER.finditer(text):
+        kind = m.lastgroup
+        value = m.group()
+
+        if kind == "email":
+            email = value.lower()
+            if email in seen:
+                continue
+            seen.add(email)
+            if links.email is None:
+                links.email = email
+            else:
+                other.append(email)
+            continue
+
+        if kind == "phone":
+            # Compare the national number so "+1 555…" and "555…" dedupe
+            digits = re.sub(r"\D", "", value)[-10:]
+            if digits in seen:
+                continue
+            seen.add(digits)
+            if links.phone is None:
+                links.phone = value.strip()
+            else:
+                other.append(value.strip())
+            continue
+
+        url = normalize_url(value)
+        link_type = detect_link_type(url)
+        if link_type == "other":
+            if links.portfolio is None:
+                links.portfolio = url
+                seen.add(url.lower())
+            else:
+                add_other(url)
+            continue
+
+        profile = _profile_url(link_type, url)
+        if profile and getattr(links, link_type) is None:
+            setattr(links, link_type, profile)
+            seen.add(profile.lower())
+            if url.lower() == profile.lower():
+                continue
+        # Repository / post links and secondary profiles land in `other`
+        add_other(url)
 
+    links.other = other
     return links
 
 
@@ -67,13 +144,7 @@ def extract_github_username(url: str) -> Optional[str]:
 
 def detect_link_type(url: str) -> str:
     """Detect the type of a given URL."""
-    url_lower = url.lower()
-    if "github.com" in url_lower:
-        return "github"
-    elif "linkedin.com" in url_lower:
-        return "linkedin"
-    elif "huggingface.co" in url_lower:
-        return "huggingface"
-    elif "leetcode.com" in url_lower:
-        return "leetcode"
-    return "other"
+    host = urlsplit(url if "//" in url else "//" + url).netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return PROFILE_HOSTS.get(host, "other")
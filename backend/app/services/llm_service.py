@@ -1,12 +1,37 @@
+import asyncio
+import hashlib
 import json
 import re
-from typing import Optional
+import time
+from typing import Any, AsyncIterator, Optional
 
 import httpx
 
 from app.config import settings
+from app.services.http_clients import get_cerebras_client
+from app.services.json_stream import JSONObjectStream
+from app.services.prompt_builder import (
+    build_job_excerpt,
+    build_resume_excerpt,
+    estimate_tokens,
+)
+from app.services.resilience import UpstreamUnavailable, guarded_request
+from app.utils.cache import TieredCache
+from app.utils.metrics import LLM_LATENCY, LLM_TOKENS, RULE_BASED_FALLBACKS
+from app.utils.singleflight import SingleFlight
 
-CEREBRAS_API_URL = "https://api.cerebras.ai/v1/chat/completions"
+CEREBRAS_API_URL = "/v1/chat/completions"  # relative to the shared client's base URL
+
+# Raw LLM results keyed by prompt hash, independent of resume/job ids
+llm_cache = TieredCache("llm_cache", settings.LLM_CACHE_SIZE)
+_llm_flight = SingleFlight("llm")
+
+# Streaming events, in the order the prompt asks the model to emit the fields
+STREAM_EVENTS = (
+    ("score", ("overall_score", "breakdown")),
+    ("skills", ("matched_skills", "missing_skills")),
+    ("feedback", ("feedback", "suggestions")),
+)
 
 ATS_PROMPT_TEMPLATE = """You are an expert ATS (Applicant Tracking System) scoring system.
 
@@ -45,60 +70,458 @@ Return ONLY valid JSON in the following format:
 }}
 """
 
+MULTI_JOB_PROMPT_TEMPLATE = """You are an expert ATS (Applicant Tracking System) scoring system.
+
+Analyze the following resume against EACH of the job descriptions below. Evaluate every job independently, as if it were the only one.
+
+## Resume Text:
+{resume_text}
+
+## Jobs:
+{jobs}
+
+Return ONLY valid JSON with exactly one entry per job, where "job" is the job's label (e.g. "J1"), in the following format:
+{{
+  "results": [
+    {{
+      "job": "J1",
+      "overall_score": <0-100>,
+      "breakdown": {{
+        "skills_match": <0-100>,
+        "experience_relevance": <0-100>,
+        "project_quality": <0-100>,
+        "cultural_fit": <0-100>
+      }},
+      "matched_skills": ["skill1", "skill2"],
+      "missing_skills": ["skill3", "skill4"],
+      "feedback": {{
+        "strengths": "Brief paragraph on candidate strengths",
+        "weaknesses": "Brief paragraph on candidate weaknesses",
+        "overall": "Brief overall assessment"
+      }},
+      "suggestions": ["Actionable improvement 1", "Actionable improvement 2"]
+    }}
+  ]
+}}
+"""
+
+
+class InvalidLLMReply(ValueError):
+    """The model answered but not with parseable JSON; carries the tokens it
+    still cost."""
+
+    def __init__(self, message: str, tokens_used: int = 0):
+        super().__init__(message)
+        self.tokens_used = tokens_used
+
+
+def normalize_skills(skills: list[str]) -> list[str]:
+    """Dedupe case-insensitively and sort, so skill order never changes the prompt."""
+    unique = {s.strip().lower(): s.strip() for s in skills if s.strip()}
+    return [unique[k] for k in sorted(unique)]
+
+
+def build_prompt(resume_text: str, job_description: str, required_skills: list[str]) -> str:
+    """Render the scoring prompt within the configured token budgets.
+
+    The resume keeps its most skill-relevant sections rather than its first
+    N characters; see prompt_builder.
+    """
+    skills = normalize_skills(required_skills)
+    return ATS_PROMPT_TEMPLATE.format(
+        resume_text=build_resume_excerpt(
+            resume_text, skills, settings.PROMPT_RESUME_TOKEN_BUDGET
+        ),
+        job_description=build_job_excerpt(
+            job_description, settings.PROMPT_JOB_TOKEN_BUDGET
+        ),
+        required_skills=", ".join(skills),
+    )
+
+
+def prompt_cache_key(prompt: str) -> str:
+    # The prompt embeds the template, so editing ATS_PROMPT_TEMPLATE or
+    # switching CEREBRAS_MODEL yields new keys and old entries just age out.
+    return hashlib.sha256(f"{settings.CEREBRAS_MODEL}\0{prompt}".encode()).hexdigest()
+
 
 async def score_resume_with_llm(
     resume_text: str,
     job_description: str,
     required_skills: list[str],
     github_score: Optional[float] = None,
+    client: Optional[httpx.AsyncClient] = None,
 ) -> dict:
-    """Call Cerebras LLM to score a resume against a job description."""
+    """Call Cerebras LLM to score a resume against a job description.
+
+    Identical prompts are answered from the LLM result cache, and concurrent
+    identical prompts share one upstream call. Uses the shared
+    keep-alive client from http_clients unless one is passed.
+
+    When Cerebras is unavailable (breaker open or retries exhausted) the
+    rule-based score is returned instead, marked ``degraded``.
+    """
 
     if not settings.CEREBRAS_API_KEY:
         # Return a rule-based mock score when no API key is configured
+        RULE_BASED_FALLBACKS.inc("no_api_key")
         return _rule_based_score(resume_text, required_skills)
 
-    prompt = ATS_PROMPT_TEMPLATE.format(
-        resume_text=resume_text[:4000],  # truncate to avoid token overflow
-        job_description=job_description[:2000],
-        required_skills=", ".join(required_skills),
+    prompt = build_prompt(resume_text, job_description, required_skills)
+    key = prompt_cache_key(prompt)
+
+    async def lookup() -> tuple[dict, int]:
+        cached = await llm_cache.get(key)
+        if cached is not None:
+            return cached, 0
+        fresh, tokens = await _call_llm(prompt, client)
+        # Cache the raw model output; GitHub blending below is per-caller
+        await llm_cache.set(key, fresh)
+        return fresh, tokens
+
+    try:
+        (result, tokens_used), shared = await _llm_flight.do(key, lookup)
+    except UpstreamUnavailable:
+        return _degraded_score(resume_text, required_skills)
+    result = dict(result)
+    if shared:
+        tokens_used = 0  # the call this one joined already accounts for them
+
+    return _finish(result, tokens_used, github_score)
+
+
+def plan_job_batches(fixed_tokens: int, job_tokens: list[int]) -> list[list[int]]:
+    """Greedily group job indexes so each call fits the model's context.
+
+    A call costs the shared prompt (``fixed_tokens``), each job's block and
+    LLM_OUTPUT_TOKENS_PER_JOB of completion per job, plus a safety margin
+    since the token counts are estimates.
+    """
+    limit = int(settings.LLM_CONTEXT_TOKENS * 0.9)
+    batches: list[list[int]] = []
+    current: list[int] = []
+    used = fixed_tokens
+    for index, tokens in enumerate(job_tokens):
+        cost = tokens + settings.LLM_OUTPUT_TOKENS_PER_JOB
+        if current and (
+            used + cost > limit or len(current) >= settings.LLM_MAX_JOBS_PER_CALL
+        ):
+            batches.append(current)
+            current, used = [], fixed_tokens
+        current.append(index)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def score_resume_against_jobs(
+    resume_text: str,
+    jobs: list[dict],
+    github_score: Optional[float] = None,
+    client: Optional[httpx.AsyncClient] = None,
+) -> tuple[dict[str, dict], dict[str, str]]:
+    """Score one resume against many jobs, several jobs per LLM call.
+
+    ``jobs`` are dicts with ``id``, ``description`` and ``required_skills``.
+    The resume is sent once per call instead of once per job. A batch reply
+    is cached under its own multi-job prompt, never under the single-job
+    keys, so each cache entry still answers exactly the prompt it was
+    produced for.
+
+    Returns ``(results, failed)`` keyed by job id; a call's tokens are split
+    evenly across the jobs it answered (or across the whole batch when its
+    reply was unusable). Jobs missing from a reply, or from a reply that
+    could not be parsed, fall back to a single-job call.
+    """
+    results: dict[str, dict] = {}
+    failed: dict[str, str] = {}
+    if not settings.CEREBRAS_API_KEY:
+        for job in jobs:
+            results[job["id"]] = await score_resume_with_llm(
+                resume_text, job["description"], job["required_skills"], github_score
+            )
+        return results, failed
+
+    keys = {
+        job["id"]: prompt_cache_key(
+            build_prompt(resume_text, job["description"], job["required_skills"])
+        )
+        for job in jobs
+    }
+    pending = []
+    for job in jobs:
+        cached = await llm_cache.get(keys[job["id"]])
+        if cached is not None:
+            results[job["id"]] = _finish(cached, 0, github_score)
+        else:
+            pending.append(job)
+
+    all_skills = normalize_skills([s for job in pending for s in job["required_skills"]])
+    resume_excerpt = build_resume_excerpt(
+        resume_text, all_skills, settings.PROMPT_RESUME_TOKEN_BUDGET
+    )
+    blocks = [
+        "Required Skills: {}\n{}".format(
+            ", ".join(normalize_skills(job["required_skills"])),
+            build_job_excerpt(job["description"], settings.PROMPT_JOB_TOKEN_BUDGET),
+        )
+        for job in pending
+    ]
+    fixed = estimate_tokens(MULTI_JOB_PROMPT_TEMPLATE) + estimate_tokens(resume_excerpt)
+    batches = plan_job_batches(fixed, [estimate_tokens(b) + 4 for b in blocks])
+
+    async def score_batch(batch: list[int]):
+        prompt = MULTI_JOB_PROMPT_TEMPLATE.format(
+            resume_text=resume_excerpt,
+            jobs="\n\n".join(f"### J{n}\n{blocks[i]}" for n, i in enumerate(batch, 1)),
+        )
+        batch_key = prompt_cache_key(prompt)
+        try:
+            data, tokens_used = await llm_cache.get(batch_key), 0
+            if data is None:
+                data, tokens_used = await _call_llm(
+                    prompt,
+                    client,
+                    max_tokens=max(1024, settings.LLM_OUTPUT_TOKENS_PER_JOB * len(batch)),
+                )
+                fresh = True
+            else:
+                fresh = False
+        except UpstreamUnavailable:
+            for i in batch:
+                results[pending[i]["id"]] = _degraded_score(
+                    resume_text, pending[i]["required_skills"]
+                )
+            return
+        except InvalidLLMReply as e:
+            # Truncated or malformed reply: every job is rescored on its own
+            data, tokens_used, fresh = {}, e.tokens_used, False
+        except Exception as e:
+            for i in batch:
+                failed[pending[i]["id"]] = f"Scoring failed: {e}"
+            return
+
+        by_label = {
+            str(item.get("job", "")).strip(): item
+            for item in data.get("results", [])
+            if isinstance(item, dict) and "overall_score" in item
+        }
+        if fresh and by_label:
+            await llm_cache.set(batch_key, {"results": list(by_label.values())})
+        labels = {i: f"J{n}" for n, i in enumerate(batch, 1)}
+        answered = [i for i in batch if labels[i] in by_label]
+        skipped = [i for i in batch if labels[i] not in by_label]
+
+        # The call's tokens go to the jobs it answered, remainder included;
+        # if it answered none, every job in the batch shares what it cost
+        payers = answered or batch
+        share, extra = divmod(tokens_used, len(payers))
+        spent = {i: share + (rank < extra) for rank, i in enumerate(payers)}
+        for i in answered:
+            raw = {k: v for k, v in by_label[labels[i]].items() if k != "job"}
+            results[pending[i]["id"]] = _finish(raw, spent[i], github_score)
+
+        async def score_alone(i: int):
+            job = pending[i]
+            try:
+                result = await score_resume_with_llm(
+                    resume_text, job["description"], job["required_skills"],
+                    github_score, client,
+                )
+            except Exception as e:
+                failed[job["id"]] = f"Scoring failed: {e}"
+                return
+            results[job["id"]] = _charge(result, result.get("tokens_used", 0) + spent.get(i, 0))
+
+        # Jobs the model skipped or the reply lost are scored one by one
+        await asyncio.gather(*(score_alone(i) for i in skipped))
+
+    await asyncio.gather(*(score_batch(batch) for batch in batches))
+    return results, failed
+
+
+async def stream_resume_score(
+    resume_text: str,
+    job_description: str,
+    required_skills: list[str],
+    github_score: Optional[float] = None,
+    client: Optional[httpx.AsyncClient] = None,
+) -> AsyncIterator[tuple[str, Any]]:
+    """Streaming variant of score_resume_with_llm.
+
+    Yields ``(event, fields)`` for each group in STREAM_EVENTS as soon as the
+    model has produced all of its fields, then ``("result", full_result)``.
+    Cached prompts and the rule-based fallback replay the same events at once.
+    """
+    if not settings.CEREBRAS_API_KEY:
+        RULE_BASED_FALLBACKS.inc("no_api_key")
+        result = _rule_based_score(resume_text, required_skills)
+        for event in score_events(result):
+            yield event
+        yield "result", result
+        return
+
+    prompt = build_prompt(resume_text, job_description, required_skills)
+    key = prompt_cache_key(prompt)
+
+    cached = await llm_cache.get(key)
+    if cached is not None:
+        result = _finish(cached, 0, github_score)
+        for event in score_events(result):
+            yield event
+        yield "result", result
+        return
+
+    raw: dict = {}
+    sent: set[str] = set()
+    tokens_used = 0
+    parser = JSONObjectStream()
+    payload = _request_payload(prompt)
+    payload["stream"] = True
+    payload["stream_options"] = {"include_usage": True}
+
+    client = client or get_cerebras_client()
+    request = client.build_request(
+        "POST", CEREBRAS_API_URL, json=payload, headers=_request_headers()
     )
+    started = time.perf_counter()
+    try:
+        async with guarded_request(client, request) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                chunk = json.loads(data)
+                if chunk.get("usage"):
+                    tokens_used = chunk["usage"].get("total_tokens", 0)
+                for choice in chunk.get("choices", []):
+                    delta = choice.get("delta", {}).get("content")
+                    if not delta:
+                        continue
+                    members = parser.feed(delta)
+                    if not members:
+                        continue
+                    raw.update(members)
+                    partial = dict(raw)
+                    if "overall_score" in partial:
+                        partial["overall_score"] = _blend(partial["overall_score"], github_score)
+                    for event in score_events(partial, sent, complete_only=True):
+                        yield event
+    except UpstreamUnavailable:
+        # Raised before any response is handed over, so nothing was streamed yet
+        result = _degraded_score(resume_text, required_skills)
+        for event in score_events(result):
+            yield event
+        yield "result", result
+        return
+
+    LLM_LATENCY.observe(time.perf_counter() - started, "stream")
+    LLM_TOKENS.inc(amount=tokens_used)
+    if not parser.done:
+        raise ValueError("LLM did not return valid JSON")
+
+    await llm_cache.set(key, raw)
+    result = _finish(raw, tokens_used, github_score)
+    for event in score_events(result, sent):
+        yield event
+    yield "result", result
+
+
+def score_events(
+    result: dict, sent: Optional[set[str]] = None, complete_only: bool = False
+) -> list[tuple[str, dict]]:
+    """STREAM_EVENTS groups not yet in ``sent`` (only fully available ones if
+    ``complete_only``), marking them sent."""
+    sent = set() if sent is None else sent
+    events = []
+    for event, fields in STREAM_EVENTS:
+        if event in sent:
+            continue
+        if complete_only and not all(f in result for f in fields):
+            continue
+        sent.add(event)
+        events.append((event, {f: result.get(f) for f in fields if f in result}))
+    return events
+
+
+def _blend(llm_score: float, github_score: Optional[float]) -> float:
+    # Blend link-verification score (30%) with LLM score (70%)
+    if github_score is None:
+        return llm_score
+    return round(llm_score * 0.7 + github_score * 0.3)
 
-    payload = {
+
+def _finish(result: dict, tokens_used: int, github_score: Optional[float]) -> dict:
+    result = dict(result)
+    if github_score is not None:
+        result["overall_score"] = _blend(result.get("overall_score", 0), github_score)
+
+    return _charge(result, tokens_used)
+
+
+def _charge(result: dict, tokens_used: int) -> dict:
+    result["tokens_used"] = tokens_used
+    result["estimated_cost"] = round(tokens_used * 0.00000094, 6)  # Cerebras pricing
+    return result
+
+
+def _request_payload(prompt: str, max_tokens: int = 1024) -> dict:
+    return {
         "model": settings.CEREBRAS_MODEL,
         "messages": [{"role": "user", "content": prompt}],
-        "max_tokens": 1024,
+        "max_tokens": max_tokens,
         "temperature": 0.2,
     }
 
-    headers = {
+
+def _request_headers() -> dict:
+    return {
         "Authorization": f"Bearer {settings.CEREBRAS_API_KEY}",
         "Content-Type": "application/json",
     }
 
-    async with httpx.AsyncClient(timeout=60) as client:
-        response = await client.post(CEREBRAS_API_URL, json=payload, headers=headers)
-        response.raise_for_status()
+
+async def _call_llm(
+    prompt: str, client: Optional[httpx.AsyncClient] = None, max_tokens: int = 1024
+) -> tuple[dict, int]:
+    client = client or get_cerebras_client()
+    request = client.build_request(
+        "POST",
+        CEREBRAS_API_URL,
+        json=_request_payload(prompt, max_tokens),
+        headers=_request_headers(),
+    )
+    with LLM_LATENCY.time("complete"):
+        async with guarded_request(client, request) as response:
+            await response.aread()
+    response.raise_for_status()
 
     data = response.json()
     content = data["choices"][0]["message"]["content"]
     tokens_used = data.get("usage", {}).get("total_tokens", 0)
+    LLM_TOKENS.inc(amount=tokens_used)
 
     # Extract JSON from response
     json_match = re.search(r"\{.*\}", content, re.DOTALL)
     if not json_match:
-        raise ValueError("LLM did not return valid JSON")
+        raise InvalidLLMReply("LLM did not return valid JSON", tokens_used)
+    try:
+        return json.loads(json_match.group()), tokens_used
+    except json.JSONDecodeError:
+        raise InvalidLLMReply("LLM did not return valid JSON", tokens_used)
 
-    result = json.loads(json_match.group())
-
-    # Blend link-verification score (30%) with LLM score (70%)
-    if github_score is not None:
-        llm_score = result.get("overall_score", 0)
-        result["overall_score"] = round(llm_score * 0.7 + github_score * 0.3)
-
-    result["tokens_used"] = tokens_used
-    result["estimated_cost"] = round(tokens_used * 0.00000094, 6)  # Cerebras pricing
 
+def _degraded_score(resume_text: str, required_skills: list[str]) -> dict:
+    RULE_BASED_FALLBACKS.inc("upstream_unavailable")
+    result = _rule_based_score(resume_text, required_skills)
+    result["feedback"]["weaknesses"] = (
+        "LLM scoring is temporarily unavailable; this is a rule-based estimate."
+    )
+    result["degraded"] = True
     return result
 
 
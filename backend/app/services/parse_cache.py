@@ -0,0 +1,25 @@
+from typing import Optional
+
+from app.config import settings
+from app.services.resume_parser import PARSER_VERSION
+from app.utils.cache import TieredCache
+
+# Only the extraction output is shared between uploads; ownership, filename
+# and timestamps always come from the upload itself.
+CACHED_FIELDS = ("parsed_text", "extracted_links", "skills", "sections", "status")
+
+_cache = TieredCache("parse_cache", settings.PARSE_CACHE_SIZE)
+
+
+def cache_key(content_hash: str) -> str:
+    return f"{PARSER_VERSION}:{content_hash}"
+
+
+async def get_cached_parse(content_hash: str) -> Optional[dict]:
+    """Return a previous parse of identical bytes, checking memory then Mongo."""
+    return await _cache.get(cache_key(content_hash))
+
+
+async def store_parse(content_hash: str, parsed: dict):
+    result = {field: parsed[field] for field in CACHED_FIELDS if field in parsed}
+    await _cache.set(cache_key(content_hash), result)
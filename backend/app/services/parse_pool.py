@@ -0,0 +1,315 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Union
+
+from app.config import settings
+from app.utils.metrics import PARSE_LATENCY
+from app.services.resume_parser import (
+    build_parse_result,
+    extract_pdf_pages,
+    parse_resume,
+    pdf_page_count,
+)
+
+START_POLL_SECONDS = 0.05  # how often a waiter checks whether its parse has started
+REAP_POLL_SECONDS = 0.5  # how often a retired pool is checked for healthy work
+
+# Raw bytes for small uploads, or the path of a spooled file the worker reads
+# itself, so large files are never pickled across the process boundary
+ParseSource = Union[bytes, str]
+
+
+class ParsePoolSaturated(Exception):
+    """Raised when every worker is busy and the wait queue is full."""
+
+
+class ParseTimeout(Exception):
+    """Raised when a single parse exceeds PARSE_TIMEOUT_SECONDS."""
+
+
+# ── Worker side ──────────────────────────────────────────────────
+# Each in-flight parse owns a row of its pool's shared arrays: ``started``
+# flags that one of its calls has begun, ``busy`` holds the pid running each
+# of its calls (one lane per page chunk), 0 when idle.
+_started = None
+_busy = None
+
+
+def _init_worker(started, busy):
+    global _started, _busy
+    _started, _busy = started, busy
+
+
+def _call(row: int, lane: int, fn, *args):
+    _started[row] = 1
+    cell = row * (len(_busy) // len(_started)) + lane
+    _busy[cell] = os.getpid()
+    try:
+        return fn(*args)
+    finally:
+        _busy[cell] = 0
+
+
+def _load(source: ParseSource) -> bytes:
+    if isinstance(source, bytes):
+        return source
+    with open(source, "rb") as f:
+        return f.read()
+
+
+def _parse_source(source: ParseSource, filename: str) -> dict:
+    return parse_resume(_load(source), filename)
+
+
+def _page_count(source: ParseSource) -> int:
+    return pdf_page_count(_load(source))
+
+
+def _extract_pages(source: ParseSource, start: int, stop: int) -> list[str]:
+    return extract_pdf_pages(_load(source), start, stop)
+
+
+# ── Parent side ──────────────────────────────────────────────────
+class _Generation:
+    """One process pool and the shared arrays its workers report into."""
+
+    def __init__(self):
+        # spawn, not fork: the parent already runs motor/uvloop threads by the
+        # time the first job is submitted, and forking those is unsafe.
+        ctx = multiprocessing.get_context("spawn")
+        rows = settings.PARSE_WORKERS + settings.PARSE_QUEUE_SIZE
+        self.width = settings.PARSE_WORKERS
+        self.started = ctx.RawArray("b", rows)
+        self.busy = ctx.RawArray("i", rows * self.width)
+        self.free_rows = list(range(rows))
+        self.jobs: set["_Job"] = set()
+        self.retired = False
+        self.reaping = False
+        self.executor = ProcessPoolExecutor(
+            max_workers=settings.PARSE_WORKERS,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(self.started, self.busy),
+        )
+
+    def pids(self, row: int) -> set[int]:
+        cells = self.busy[row * self.width:(row + 1) * self.width]
+        return {pid for pid in cells if pid}
+
+
+class _Job:
+    """Parent-side record of one parse: which pool row it is reporting into."""
+
+    def __init__(self):
+        self.gen: Optional[_Generation] = None
+        self.row = -1
+        self.hung = False
+
+    def attach(self, gen: Optional[_Generation]):
+        self.gen = gen
+        if gen is not None:
+            self.row = gen.free_rows.pop()
+            gen.started[self.row] = 0
+            gen.jobs.add(self)
+
+    def detach(self):
+        if self.gen is not None and self in self.gen.jobs:
+            self.gen.jobs.discard(self)
+            self.gen.free_rows.append(self.row)
+
+    def has_started(self) -> bool:
+        return self.gen is None or bool(self.gen.started[self.row])
+
+
+_current: Optional[_Generation] = None
+_fallback: Optional[ThreadPoolExecutor] = None  # one thread: pdfium is not thread-safe
+_in_flight = 0
+_jobs: dict[asyncio.Future, _Job] = {}  # in-flight parse -> its job record
+
+
+def start_parse_pool():
+    global _current
+    _current = _Generation()
+    print(f"Resume parse pool started with {settings.PARSE_WORKERS} workers")
+
+
+def stop_parse_pool():
+    global _current
+    if _current:
+        _current.executor.shutdown(wait=False, cancel_futures=True)
+        _current = None
+        print("Resume parse pool stopped")
+
+
+def pool_stats() -> dict:
+    return {
+        "workers": settings.PARSE_WORKERS,
+        "capacity": settings.PARSE_WORKERS + settings.PARSE_QUEUE_SIZE,
+        "in_flight": _in_flight,
+    }
+
+
+def _release(future):
+    global _in_flight
+    _in_flight -= 1
+    _jobs.pop(future, None)
+    if not future.cancelled():
+        future.exception()  # a timed-out parse's outcome has no one left to read it
+
+
+def _retire(gen: _Generation):
+    """Stop giving ``gen`` new work and, if it was current, replace it.
+
+    Parses already queued in it keep running there; a pool only ever
+    retires once, however many of its parses fail or time out.
+    """
+    if gen.retired:
+        return
+    gen.retired = True
+    # No cancel_futures: parses queued in the old pool still run there
+    gen.executor.shutdown(wait=False)
+    if gen is _current:
+        start_parse_pool()
+
+
+def _reap(gen: _Generation):
+    """Kill the hung workers of a retired pool once nothing healthy runs in it.
+
+    Killing any worker breaks the whole executor, so healthy parses still in
+    progress are left to finish first; parses that never started are then
+    resubmitted to the current pool by _parse.
+    """
+    if any(not job.hung and job.has_started() for job in gen.jobs):
+        asyncio.get_running_loop().call_later(REAP_POLL_SECONDS, _reap, gen)
+        return
+    hung = set()
+    for job in gen.jobs:
+        if job.hung:
+            hung |= gen.pids(job.row)
+    for process in multiprocessing.active_children():
+        if process.pid in hung:
+            process.kill()
+    gen.reaping = False
+
+
+def _hang(job: _Job):
+    job.hung = True
+    gen = job.gen
+    _retire(gen)
+    if not gen.reaping:
+        gen.reaping = True
+        _reap(gen)
+
+
+def submit_parse(source: ParseSource, filename: str) -> asyncio.Future:
+    """Queue a parse and return an awaitable for its result.
+
+    A path ``source`` must stay readable until the returned future is done.
+    The slot is reserved synchronously so callers learn about saturation
+    before they commit to a response, and it is only released when the
+    worker actually finishes — a timed-out parse keeps occupying its slot
+    until its worker is reaped.
+    """
+    global _in_flight
+    if _in_flight >= settings.PARSE_WORKERS + settings.PARSE_QUEUE_SIZE:
+        raise ParsePoolSaturated("Resume parser is busy, please retry shortly.")
+
+    job = _Job()
+    job.attach(_current)
+    future = asyncio.ensure_future(_parse(job, source, filename))
+    _in_flight += 1
+    _jobs[future] = job
+    future.add_done_callback(_release)
+
+    started = time.perf_counter()
+    fmt = os.path.splitext(filename)[1].lower().lstrip(".") or "unknown"
+    future.add_done_callback(
+        lambda _: PARSE_LATENCY.observe(time.perf_counter() - started, fmt)
+    )
+    return future
+
+
+def _run(job: _Job, lane: int, fn, *args) -> asyncio.Future:
+    global _fallback
+    loop = asyncio.get_running_loop()
+    if job.gen is None:
+        # Without a pool (scripts, tests) fall back to a single thread, so two
+        # parses never drive pdfium at the same time
+        if _fallback is None:
+            _fallback = ThreadPoolExecutor(max_workers=1, thread_name_prefix="parse")
+        return loop.run_in_executor(_fallback, fn, *args)
+    return loop.run_in_executor(job.gen.executor, _call, job.row, lane, fn, *args)
+
+
+async def _parse(job: _Job, source: ParseSource, filename: str) -> dict:
+    try:
+        for attempt in range(2):
+            try:
+                if filename.lower().endswith(".pdf"):
+                    return await _parse_pdf(job, source, filename)
+                return await _run(job, 0, _parse_source, source, filename)
+            except BrokenProcessPool:
+                # A worker died (OOM on a hostile PDF, or reaped after a
+                # timeout), which breaks every parse left in its pool
+                _retire(job.gen)
+                if job.has_started() or job.hung or attempt:
+                    raise ValueError("Resume parser crashed while reading this file.")
+                # This one never reached a worker: run it in the new pool
+                job.detach()
+                job.attach(_current)
+    finally:
+        job.detach()
+
+
+async def _parse_pdf(job: _Job, source: ParseSource, filename: str) -> dict:
+    """Parse a PDF, fanning long documents out across workers by page range.
+
+    A document holds a single queue slot; its page chunks are capped at
+    PARSE_WORKERS so one long CV cannot monopolise more than the pool.
+    Without a pool there is nothing to fan out to, so the whole document is
+    parsed in one call on the fallback thread.
+    """
+    if job.gen is None:
+        return await _run(job, 0, _parse_source, source, filename)
+    pages = min(await _run(job, 0, _page_count, source), settings.PDF_MAX_PAGES)
+    per_worker = max(settings.PDF_PAGES_PER_WORKER, -(-pages // settings.PARSE_WORKERS))
+    if pages <= per_worker:
+        return await _run(job, 0, _parse_source, source, filename)
+
+    chunks = await asyncio.gather(
+        *(
+            _run(job, lane, _extract_pages, source, start, min(start + per_worker, pages))
+            for lane, start in enumerate(range(0, pages, per_worker))
+        )
+    )
+    text = "\n".join(t for chunk in chunks for t in chunk if t.strip()).strip()
+    return await _run(job, 0, build_parse_result, text)
+
+
+async def wait_parse(future: asyncio.Future) -> dict:
+    """Result of a submitted parse, allowing PARSE_TIMEOUT_SECONDS of work.
+
+    The clock starts when a worker picks the parse up, so time spent queued
+    behind a burst of uploads does not count against it.
+    """
+    job = _jobs.get(future)
+    while job is not None and not future.done() and not job.has_started():
+        await asyncio.wait({future}, timeout=START_POLL_SECONDS)
+    try:
+        return await asyncio.wait_for(
+            asyncio.shield(future), timeout=settings.PARSE_TIMEOUT_SECONDS
+        )
+    except asyncio.TimeoutError:
+        # The worker may never come back; don't let it hold a slot for good
+        if job is not None and job.gen is not None:
+            _hang(job)
+        raise ParseTimeout("Resume parsing timed out.")
+
+
+async def run_parse(source: ParseSource, filename: str) -> dict:
+    """Parse a resume in the worker pool without blocking the event loop."""
+    return await wait_parse(submit_parse(source, filename))
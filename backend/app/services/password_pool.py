@@ -0,0 +1,79 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.config import settings
+from app.utils.metrics import PASSWORD_HASH_LATENCY, PASSWORD_HASH_REJECTED, PASSWORD_HASH_WAIT
+
+# bcrypt releases the GIL while it works, so threads are enough to keep it
+# off the event loop; the small, separate pool keeps a login burst from
+# taking over the default executor that Motor and file I/O share.
+_executor: Optional[ThreadPoolExecutor] = None
+_in_flight = 0
+
+
+class PasswordPoolSaturated(Exception):
+    """Raised when every hashing worker is busy and the wait queue is full."""
+
+
+def start_password_pool():
+    global _executor
+    _executor = ThreadPoolExecutor(
+        max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt"
+    )
+    print(f"Password hashing pool started with {settings.PASSWORD_HASH_WORKERS} workers")
+
+
+def stop_password_pool():
+    global _executor
+    if _executor:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def pool_stats() -> dict:
+    return {
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "capacity": settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_SIZE,
+        "in_flight": _in_flight,
+        # Every in-flight call beyond the worker count is waiting for a thread
+        "queued": max(0, _in_flight - settings.PASSWORD_HASH_WORKERS),
+    }
+
+
+def _release():
+    global _in_flight
+    _in_flight -= 1
+
+
+async def run_hashing(op: str, fn: Callable[..., Any], *args) -> Any:
+    """Run one bcrypt operation (``op`` labels the metrics) in the pool.
+
+    Raises PasswordPoolSaturated straight away rather than queueing without
+    bound. A slot is held until the worker finishes, even if the caller
+    has gone away.
+    """
+    global _in_flight
+    if _in_flight >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_SIZE:
+        PASSWORD_HASH_REJECTED.inc(op)
+        raise PasswordPoolSaturated("Too many sign-in attempts in progress, please retry shortly.")
+
+    loop = asyncio.get_running_loop()
+    submitted = time.perf_counter()
+
+    def work():
+        started = time.perf_counter()
+        return fn(*args), started - submitted, time.perf_counter() - started
+
+    if _executor is None:
+        # Without a pool (scripts) fall back to the default thread executor
+        value, waited, took = await loop.run_in_executor(None, work)
+    else:
+        future = _executor.submit(work)
+        _in_flight += 1
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(_release))
+        value, waited, took = await asyncio.wrap_future(future)
+    PASSWORD_HASH_WAIT.observe(waited, op)
+    PASSWORD_HASH_LATENCY.observe(took, op)
+    return value
@@ -0,0 +1,102 @@
+import io
+import unicodedata
+
+# A page whose fast-tier text falls below either bar is re-read with pdfplumber
+MIN_CHARS_PER_PAGE = 40
+MAX_GARBAGE_RATIO = 0.15
+
+_GARBAGE_CATEGORIES = {"Cc", "Co", "Cn", "Cs"}
+
+
+def page_count(file_bytes: bytes) -> int:
+    try:
+        import pypdfium2
+        pdf = pypdfium2.PdfDocument(file_bytes)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+    except ImportError:
+        import PyPDF2
+        return len(PyPDF2.PdfReader(io.BytesIO(file_bytes)).pages)
+
+
+def garbage_ratio(text: str) -> float:
+    """Share of characters that are control, private-use or replacement chars."""
+    if not text:
+        return 0.0
+    bad = sum(
+        1 for ch in text
+        if ch == "\ufffd"
+        or (ch not in "\n\r\t" and unicodedata.category(ch) in _GARBAGE_CATEGORIES)
+    )
+    # pdfminer renders unmapped glyphs as "(cid:123)"
+    bad += text.count("(cid:") * 8
+    return bad / len(text)
+
+
+def page_is_usable(text: str) -> bool:
+    stripped = text.strip()
+    return (
+        len(stripped) >= MIN_CHARS_PER_PAGE
+        and garbage_ratio(stripped) <= MAX_GARBAGE_RATIO
+    )
+
+
+def _fast_pages(file_bytes: bytes, start: int, stop: int) -> list[str]:
+    """pdfium's C text layer; PyPDF2 when pypdfium2 is unavailable."""
+    try:
+        import pypdfium2
+    except ImportError:
+        import PyPDF2
+        reader = PyPDF2.PdfReader(io.BytesIO(file_bytes))
+        return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+    pdf = pypdfium2.PdfDocument(file_bytes)
+    try:
+        texts = []
+        for i in range(start, stop):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            texts.append(textpage.get_text_range().replace("\r\n", "\n"))
+            textpage.close()
+            page.close()
+        return texts
+    finally:
+        pdf.close()
+
+
+def _plumber_pages(file_bytes: bytes, indices: list[int]) -> dict[int, str]:
+    import pdfplumber
+    with pdfplumber.open(io.BytesIO(file_bytes), pages=[i + 1 for i in indices]) as pdf:
+        return {
+            idx: page.extract_text() or ""
+            for idx, page in zip(indices, pdf.pages)
+        }
+
+
+def extract_pages(file_bytes: bytes, start: int, stop: int) -> list[str]:
+    """Extract pages [start, stop), escalating only weak pages to pdfplumber."""
+    try:
+        texts = _fast_pages(file_bytes, start, stop)
+    except Exception:
+        texts = [""] * (stop - start)
+
+    weak = [start + i for i, text in enumerate(texts) if not page_is_usable(text)]
+    if weak:
+        try:
+            for idx, text in _plumber_pages(file_bytes, weak).items():
+                # Keep whichever tier produced the more usable page
+                if page_is_usable(text) or len(text.strip()) > len(texts[idx - start].strip()):
+                    texts[idx - start] = text
+        except Exception:
+            pass
+    return texts
+
+
+def extract_text(file_bytes: bytes, max_pages: int) -> str:
+    try:
+        total = min(page_count(file_bytes), max_pages)
+    except Exception:
+        return ""
+    return "\n".join(t for t in extract_pages(file_bytes, 0, total) if t.strip()).strip()
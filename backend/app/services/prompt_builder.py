@@ -0,0 +1,131 @@
+import re
+
+from app.services.link_extractor import SCANNER
+from app.services.resume_parser import SKILL_ALIASES, extract_sections
+from app.services.skill_matcher import SkillMatcher
+
+# Base priority of each extract_sections() key; skill hits are added on top.
+# "general" is whatever precedes the first header: name and contact lines.
+SECTION_PRIORITY = {
+    "skills": 6,
+    "experience": 5,
+    "work experience": 5,
+    "projects": 4,
+    "summary": 3,
+    "certifications": 2,
+    "achievements": 2,
+    "education": 2,
+    "publications": 1,
+    "objective": 1,
+    "general": 0,
+}
+SKILL_HIT_WEIGHT = 2
+
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+_BOILERPLATE = re.compile(
+    r"^(?:page \d+( of \d+)?|references available( upon| on)? request\.?|curriculum vitae|resume)$",
+    re.IGNORECASE,
+)
+_BULLET = re.compile(r"^[•●▪◦‣*·-]+\s*")
+
+
+def estimate_tokens(text: str) -> int:
+    """Local approximation of a BPE token count.
+
+    Words and punctuation count as one token each, with long words split
+    every 8 characters; close enough to budget a prompt without a tokenizer.
+    """
+    return sum(1 + (len(t) - 1) // 8 for t in _TOKEN.findall(text))
+
+
+def _is_contact_line(line: str) -> bool:
+    # Emails, phones and profile links are already extracted and scored
+    # separately, so a line made only of them carries nothing for the LLM
+    rest = SCANNER.sub("", line)
+    return rest != line and not rest.strip(" \t|•·,;:/-")
+
+
+def compact(text: str) -> str:
+    """Collapse whitespace and bullets, and drop boilerplate, contact and repeated lines."""
+    lines = []
+    seen = set()
+    for line in text.splitlines():
+        line = _BULLET.sub("- ", " ".join(line.split()))
+        key = line.lower()
+        if not line or key in seen or _BOILERPLATE.match(line) or _is_contact_line(line):
+            continue
+        seen.add(key)
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def fit(text: str, budget: int) -> str:
+    """Longest prefix of whole lines (then whole words) within ``budget`` tokens."""
+    kept: list[str] = []
+    used = 0
+    for line in text.splitlines():
+        cost = estimate_tokens(line) + 1  # newline
+        if used + cost <= budget:
+            kept.append(line)
+            used += cost
+            continue
+        words = []
+        for word in line.split():
+            cost = estimate_tokens(word)
+            if used + cost > budget:
+                break
+            words.append(word)
+            used += cost
+        if words:
+            kept.append(" ".join(words))
+        break
+    return "\n".join(kept)
+
+
+def rank_sections(sections: dict[str, str], required_skills: list[str]) -> list[str]:
+    """Section names, most useful for scoring against ``required_skills`` first."""
+    matcher = SkillMatcher(required_skills, SKILL_ALIASES)
+
+    def relevance(name: str) -> int:
+        hits = sum(m.count for m in matcher.find(sections[name]).values())
+        return SECTION_PRIORITY.get(name, 1) + hits * SKILL_HIT_WEIGHT
+
+    return sorted(sections, key=relevance, reverse=True)
+
+
+def build_resume_excerpt(resume_text: str, required_skills: list[str], budget: int) -> str:
+    """Fit the most relevant resume sections into ``budget`` tokens.
+
+    Sections that fit whole are taken in relevance order; the budget left
+    over is then spent on the beginnings of those that did not (typically a
+    long experience section). Output keeps document order.
+    """
+    sections = {
+        name: body
+        for name, body in ((n, compact(b)) for n, b in extract_sections(resume_text).items())
+        if body
+    }
+    chosen: dict[str, str] = {}
+    remaining = budget
+    overflow = []
+    for name in rank_sections(sections, required_skills):
+        block = f"{name.upper()}:\n{sections[name]}"
+        cost = estimate_tokens(block) + block.count("\n") + 2
+        if cost <= remaining:
+            chosen[name] = block
+            remaining -= cost
+        else:
+            overflow.append(name)
+
+    for name in overflow:
+        header = f"{name.upper()}:"
+        body = fit(sections[name], remaining - estimate_tokens(header) - 2)
+        if body:
+            chosen[name] = f"{header}\n{body}"
+            remaining -= estimate_tokens(chosen[name]) + chosen[name].count("\n") + 2
+
+    return "\n\n".join(chosen[name] for name in sections if name in chosen)
+
+
+def build_job_excerpt(job_description: str, budget: int) -> str:
+    return fit(compact(job_description), budget)
@@ -0,0 +1,234 @@
+import asyncio
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Optional
+
+import httpx
+
+from app.config import settings
+from app.utils.metrics import BREAKER_OPENED, UPSTREAM_RETRIES
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class UpstreamUnavailable(Exception):
+    """Raised when the breaker is open or retries are exhausted."""
+
+
+class AdaptiveLimit:
+    """AIMD concurrency limit.
+
+    Every fast success adds 1/limit (about +1 per round of calls); a 429 or a
+    call slower than ``latency_target`` halves the limit, at most once per
+    smoothed round-trip so a burst of rejections counts as one signal.
+    """
+
+    def __init__(self, minimum: int, maximum: int, initial: int, latency_target: float):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.latency_target = latency_target
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._rtt = 0.0
+        self._last_decrease = 0.0
+
+    async def acquire(self):
+        while self.in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                self._wake()
+                raise
+        self.in_flight += 1
+
+    def release(self):
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self):
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def on_success(self, latency: float):
+        self._rtt = latency if not self._rtt else 0.8 * self._rtt + 0.2 * latency
+        if latency > self.latency_target:
+            self.on_overload()
+            return
+        self.limit = min(self.maximum, self.limit + 1 / self.limit)
+        self._wake()
+
+    def on_overload(self):
+        now = time.monotonic()
+        if now - self._last_decrease < self._rtt:
+            return
+        self._last_decrease = now
+        self.limit = max(self.minimum, self.limit / 2)
+
+    def stats(self) -> dict:
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+        }
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open -> half-open (one probe)."""
+
+    def __init__(self, name: str, failure_threshold: int, reset_after: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_started: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.reset_after:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        now = time.monotonic()
+        # One probe at a time; a probe that never reported back (cancelled
+        # caller) is given up on after another reset period
+        if state == "half_open" and (
+            self._probe_started is None or now - self._probe_started > self.reset_after
+        ):
+            self._probe_started = now
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._probe_started = None
+
+    def record_failure(self):
+        self.failures += 1
+        probing = self._probe_started is not None
+        if probing or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                BREAKER_OPENED.inc(self.name)
+            self.opened_at = time.monotonic()
+            self._probe_started = None
+
+    def stats(self) -> dict:
+        return {"state": self.state, "consecutive_failures": self.failures}
+
+
+def retry_delay(attempt: int, response: Optional[httpx.Response] = None) -> Optional[float]:
+    """Seconds to wait before retry number ``attempt`` (0-based).
+
+    Honours a Retry-After header (seconds or HTTP date); otherwise full-jitter
+    exponential backoff capped at LLM_RETRY_MAX_SECONDS. Returns None when
+    Retry-After asks for longer than that cap: retrying sooner would only be
+    rejected again, so the caller should give up instead.
+    """
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                when = parsedate_to_datetime(retry_after)
+                delay = (when - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                delay = None
+        if delay is not None:
+            return max(delay, 0.0) if delay <= settings.LLM_RETRY_MAX_SECONDS else None
+    ceiling = settings.LLM_RETRY_BASE_SECONDS * 2 ** attempt
+    return random.uniform(0, min(ceiling, settings.LLM_RETRY_MAX_SECONDS))
+
+
+cerebras_limit = AdaptiveLimit(
+    settings.LLM_MIN_CONCURRENCY,
+    settings.LLM_MAX_CONCURRENCY,
+    settings.LLM_INITIAL_CONCURRENCY,
+    settings.LLM_LATENCY_TARGET_SECONDS,
+)
+cerebras_breaker = CircuitBreaker(
+    "cerebras", settings.LLM_BREAKER_FAILURES, settings.LLM_BREAKER_RESET_SECONDS
+)
+
+
+@asynccontextmanager
+async def guarded_request(
+    client: httpx.AsyncClient, request: httpx.Request
+) -> AsyncIterator[httpx.Response]:
+    """Send a Cerebras request through the limiter, retries and breaker.
+
+    Yields the (unread) response once it is successful or non-retryable; the
+    concurrency slot is held until the caller leaves the block, so streamed
+    generations count against the limit for their whole duration.
+
+    Only transport errors and RETRYABLE_STATUS (429 included) count as
+    breaker failures. Any other 4xx is recorded as a success: the upstream
+    answered promptly, and a bad request or key will not be fixed by
+    failing fast for everyone else.
+    """
+    attempt = 0
+    while True:
+        if not cerebras_breaker.allow():
+            raise UpstreamUnavailable("LLM circuit breaker is open")
+
+        await cerebras_limit.acquire()
+        response = None
+        started = time.perf_counter()
+        try:
+            try:
+                response = await client.send(request, stream=True)
+            except httpx.TransportError as e:
+                cause = type(e).__name__
+            else:
+                if response.status_code not in RETRYABLE_STATUS:
+                    cerebras_limit.on_success(time.perf_counter() - started)
+                    cerebras_breaker.record_success()
+                    try:
+                        yield response
+                    finally:
+                        await response.aclose()
+                    return
+                cause = str(response.status_code)
+                await response.aclose()
+        finally:
+            cerebras_limit.release()
+
+        if response is not None and response.status_code == 429:
+            cerebras_limit.on_overload()
+        cerebras_breaker.record_failure()
+
+        if attempt >= settings.LLM_MAX_RETRIES:
+            raise UpstreamUnavailable(f"LLM upstream failed after {attempt + 1} attempts ({cause})")
+        delay = retry_delay(attempt, response)
+        if delay is None:
+            raise UpstreamUnavailable(
+                f"LLM upstream asked to retry after more than "
+                f"{settings.LLM_RETRY_MAX_SECONDS:g}s ({cause})"
+            )
+        UPSTREAM_RETRIES.inc("cerebras", cause)
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+def resilience_stats() -> dict:
+    return {"cerebras": {**cerebras_limit.stats(), "breaker": cerebras_breaker.stats()}}
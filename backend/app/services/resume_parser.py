@@ -1,9 +1,14 @@
 import io
-import re
 from typing import Optional
 
+from app.config import settings
 from app.models.resume import ExtractedLinks
+from app.services import pdf_extractor
 from app.services.link_extractor import extract_all_links
+from app.services.skill_matcher import SkillMatch, SkillMatcher
+
+# Bump whenever extraction output changes so cached parse results are ignored
+PARSER_VERSION = "3"
 
 # Tech skills database (subset — extend as needed)
 TECH_SKILLS = [
@@ -29,30 +34,57 @@ TECH_SKILLS = [
     "git", "jira", "figma", "postman", "pytest", "jest", "cypress",
 ]
 
+# Common spellings that should count as a canonical TECH_SKILLS entry
+SKILL_ALIASES = {
+    "golang": "go",
+    "js": "javascript",
+    "ts": "typescript",
+    "csharp": "c#",
+    "cpp": "c++",
+    "reactjs": "react",
+    "react.js": "react",
+    "nextjs": "next.js",
+    "vuejs": "vue",
+    "vue.js": "vue",
+    "angularjs": "angular",
+    "tailwindcss": "tailwind",
+    "nodejs": "node.js",
+    "node": "node.js",
+    "nest.js": "nestjs",
+    "spring-boot": "spring boot",
+    "restful api": "rest api",
+    "rest apis": "rest api",
+    "mongo": "mongodb",
+    "postgres": "postgresql",
+    "elastic search": "elasticsearch",
+    "amazon web services": "aws",
+    "google cloud": "gcp",
+    "k8s": "kubernetes",
+    "gh actions": "github actions",
+    "sklearn": "scikit-learn",
+    "huggingface": "hugging face",
+    "ml": "machine learning",
+    "natural language processing": "nlp",
+}
+
+_skill_matcher = SkillMatcher(TECH_SKILLS, SKILL_ALIASES)
+
 
 def extract_text_from_pdf(file_bytes: bytes) -> str:
-    """Extract text from PDF using pdfplumber (primary) with PyPDF2 fallback."""
-    text = ""
-    try:
-        import pdfplumber
-        with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-    except Exception:
-        pass
+    """Extract text from PDF: fast pdfium pass, pdfplumber only for weak pages."""
+    return pdf_extractor.extract_text(file_bytes, settings.PDF_MAX_PAGES)
+
+
+def extract_pdf_pages(file_bytes: bytes, start: int, stop: int) -> list[str]:
+    """Extract one page range; used to spread long PDFs across parse workers."""
+    return pdf_extractor.extract_pages(file_bytes, start, stop)
 
-    if not text.strip():
-        try:
-            import PyPDF2
-            reader = PyPDF2.PdfReader(io.BytesIO(file_bytes))
-            for page in reader.pages:
-                text += (page.extract_text() or "") + "\n"
-        except Exception:
-            pass
 
-    return text.strip()
+def pdf_page_count(file_bytes: bytes) -> int:
+    try:
+        return pdf_extractor.page_count(file_bytes)
+    except Exception:
+        return 0
 
 
 def extract_text_from_docx(file_bytes: bytes) -> str:
@@ -66,15 +98,13 @@ def extract_text_from_docx(file_bytes: bytes) -> str:
 
 
 def extract_skills(text: str) -> list[str]:
-    """Match tech skills from text."""
-    text_lower = text.lower()
-    found = []
-    for skill in TECH_SKILLS:
-        # Use word boundary matching for short skills to avoid false positives
-        pattern = r"\b" + re.escape(skill.lower()) + r"\b"
-        if re.search(pattern, text_lower):
-            found.append(skill)
-    return list(set(found))
+    """Match tech skills (including aliases) from text in a single pass."""
+    return _skill_matcher.skills(text)
+
+
+def extract_skill_matches(text: str) -> dict[str, SkillMatch]:
+    """Like extract_skills, but with per-skill counts and match positions."""
+    return _skill_matcher.find(text)
 
 
 def extract_sections(text: str) -> dict:
@@ -119,6 +149,11 @@ def parse_resume(file_bytes: bytes, filename: str) -> dict:
     else:
         raise ValueError("Unsupported file type. Only PDF and DOCX are allowed.")
 
+    return build_parse_result(text)
+
+
+def build_parse_result(text: str) -> dict:
+    """Run link, skill and section extraction over already-extracted text."""
     if not text:
         raise ValueError("Could not extract text from resume.")
 
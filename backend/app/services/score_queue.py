@@ -0,0 +1,247 @@
+import asyncio
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Optional
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+from app.config import settings
+from app.database import get_db
+from app.services.scoring import cached_github_score, find_fresh_score, score_and_store
+
+TERMINAL_STATES = {"done", "failed"}
+
+_workers: list[asyncio.Task] = []
+_wakeup: Optional[asyncio.Event] = None
+# In-process completion signals for long-polling clients, keyed by job id
+_completions: dict[str, asyncio.Event] = {}
+_worker_prefix = f"{os.uname().nodename}:{os.getpid()}"
+
+
+def public_job(doc: dict) -> dict:
+    return {
+        "id": str(doc["_id"]),
+        "status": doc["status"],
+        "resume_id": doc["resume_id"],
+        "job_id": doc["job_id"],
+        "attempts": doc.get("attempts", 0),
+        "score_id": doc.get("score_id"),
+        "error": doc.get("error"),
+        "created_at": doc["created_at"],
+        "finished_at": doc.get("finished_at"),
+    }
+
+
+async def enqueue_score(resume_id: str, job_id: str, user_id: str) -> dict:
+    now = datetime.utcnow()
+    doc = {
+        "resume_id": resume_id,
+        "job_id": job_id,
+        "user_id": user_id,
+        "status": "queued",
+        "attempts": 0,
+        "run_after": now,
+        "lease_until": None,
+        "score_id": None,
+        "error": None,
+        "created_at": now,
+    }
+    result = await get_db().score_jobs.insert_one(doc)
+    doc["_id"] = result.inserted_id
+    if _wakeup is not None:
+        _wakeup.set()
+    return doc
+
+
+async def _claim(worker_id: str) -> Optional[dict]:
+    """Atomically lease the oldest runnable job (or one whose lease expired).
+
+    An expired lease means the worker holding it died or hung; such a job is
+    taken again only while it has attempts left, otherwise it is failed here
+    so a job that kills its worker is not retried forever.
+    """
+    db = get_db()
+    now = datetime.utcnow()
+    max_attempts = settings.SCORE_JOB_MAX_ATTEMPTS
+    await db.score_jobs.update_many(
+        {"status": "running", "lease_until": {"$lt": now}, "attempts": {"$gte": max_attempts}},
+        {
+            "$set": {
+                "status": "failed",
+                "error": f"Abandoned by its worker {max_attempts} times",
+                "lease_until": None,
+                "finished_at": now,
+            }
+        },
+    )
+    return await db.score_jobs.find_one_and_update(
+        {
+            "$or": [
+                {"status": "queued", "run_after": {"$lte": now}},
+                {
+                    "status": "running",
+                    "lease_until": {"$lt": now},
+                    "attempts": {"$lt": max_attempts},
+                },
+            ]
+        },
+        {
+            "$set": {
+                "status": "running",
+                "worker": worker_id,
+                "lease_until": now + timedelta(seconds=settings.SCORE_JOB_LEASE_SECONDS),
+            },
+            "$inc": {"attempts": 1},
+        },
+        sort=[("run_after", 1)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+async def _run_job(job: dict) -> str:
+    """Score the job's pair (reusing a fresh score if there is one)."""
+    db = get_db()
+    cached = await find_fresh_score(job["resume_id"], job["job_id"])
+    if cached:
+        return str(cached["_id"])
+
+    resume = await db.resumes.find_one({"_id": ObjectId(job["resume_id"])})
+    target = await db.jobs.find_one({"_id": ObjectId(job["job_id"])})
+    if not resume or not target:
+        raise LookupError("Resume or job no longer exists")
+
+    doc = await score_and_store(resume, target, await cached_github_score(resume))
+    return doc["_id"]
+
+
+def _backoff(attempts: int) -> float:
+    base = settings.SCORE_JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+    return min(base, 300) * random.uniform(0.5, 1.5)
+
+
+async def _finish(job: dict, update: dict):
+    # Only the current lease holder may record the outcome
+    await get_db().score_jobs.update_one(
+        {"_id": job["_id"], "worker": job["worker"]}, {"$set": update}
+    )
+    event = _completions.get(str(job["_id"]))
+    if event is not None:
+        event.set()
+
+
+async def _renew_lease(job: dict):
+    """Keep extending the lease while the job runs.
+
+    A job can legitimately outlast SCORE_JOB_LEASE_SECONDS (LLM retries and
+    backoff), and without renewal another worker would claim it mid-run.
+    """
+    interval = settings.SCORE_JOB_LEASE_SECONDS / 3
+    while True:
+        await asyncio.sleep(interval)
+        lease_until = datetime.utcnow() + timedelta(seconds=settings.SCORE_JOB_LEASE_SECONDS)
+        try:
+            result = await get_db().score_jobs.update_one(
+                {"_id": job["_id"], "worker": job["worker"]},
+                {"$set": {"lease_until": lease_until}},
+            )
+        except Exception as e:
+            print(f"Score worker {job['worker']} lease renewal failed: {e}")
+            continue
+        if result.matched_count == 0:
+            # Claimed by someone else; _finish will not overwrite their outcome
+            return
+
+
+async def _worker(worker_id: str):
+    while True:
+        # Clear before claiming so an enqueue racing with an empty claim
+        # still wakes this worker instead of waiting out the poll interval
+        _wakeup.clear()
+        try:
+            job = await _claim(worker_id)
+        except Exception as e:
+            print(f"Score worker {worker_id} claim failed: {e}")
+            job = None
+
+        if job is None:
+            try:
+                await asyncio.wait_for(
+                    _wakeup.wait(), timeout=settings.SCORE_QUEUE_POLL_SECONDS
+                )
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        renewal = asyncio.create_task(_renew_lease(job))
+        try:
+            score_id = await _run_job(job)
+        except Exception as e:
+            now = datetime.utcnow()
+            retryable = not isinstance(e, LookupError)
+            if retryable and job["attempts"] < settings.SCORE_JOB_MAX_ATTEMPTS:
+                delay = timedelta(seconds=_backoff(job["attempts"]))
+                update = {
+                    "status": "queued",
+                    "error": str(e),
+                    "lease_until": None,
+                    "run_after": now + delay,
+                }
+            else:
+                update = {"status": "failed", "error": str(e), "finished_at": now}
+        else:
+            update = {
+                "status": "done",
+                "score_id": score_id,
+                "error": None,
+                "finished_at": datetime.utcnow(),
+            }
+        finally:
+            renewal.cancel()
+
+        try:
+            await _finish(job, update)
+        except Exception as e:
+            # The lease lapses and the job is claimed again; a finished score
+            # is then picked up by find_fresh_score instead of recomputed
+            print(f"Score worker {worker_id} could not record job {job['_id']}: {e}")
+
+
+def start_score_workers():
+    global _wakeup
+    _wakeup = asyncio.Event()
+    for i in range(settings.SCORE_WORKERS):
+        _workers.append(asyncio.create_task(_worker(f"{_worker_prefix}:{i}")))
+    print(f"Started {settings.SCORE_WORKERS} ATS scoring workers")
+
+
+async def stop_score_workers():
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+
+
+async def get_job(job_id: ObjectId, user_id: str, wait: float = 0) -> Optional[dict]:
+    """Fetch a job, optionally long-polling up to ``wait`` seconds for completion.
+
+    Completion in this process wakes the waiter at once; jobs finished by
+    another replica are picked up by re-reading Mongo every second.
+    """
+    db = get_db()
+    deadline = asyncio.get_running_loop().time() + wait
+    key = str(job_id)
+    event = _completions.setdefault(key, asyncio.Event())
+    try:
+        while True:
+            doc = await db.score_jobs.find_one({"_id": job_id, "user_id": user_id})
+            remaining = deadline - asyncio.get_running_loop().time()
+            if not doc or doc["status"] in TERMINAL_STATES or remaining <= 0:
+                return doc
+            try:
+                await asyncio.wait_for(event.wait(), timeout=min(remaining, 1.0))
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        _completions.pop(key, None)
@@ -0,0 +1,333 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Optional
+
+from bson import ObjectId
+from pymongo import InsertOne
+
+from app.config import settings
+from app.database import get_db
+from app.models.ats_score import (
+    ATSScorePublic,
+    BatchScoreResponse,
+    JobMatch,
+    JobPrerank,
+    MultiJobScoreResponse,
+    PrerankCandidate,
+    PrerankResponse,
+    RankedScore,
+)
+from app.services.link_extractor import extract_github_username
+from app.services.skill_matrix import SkillMatrix
+from app.services.llm_service import (
+    score_events,
+    score_resume_against_jobs,
+    score_resume_with_llm,
+    stream_resume_score,
+)
+
+SCORE_CACHE_TTL = timedelta(days=7)
+
+
+def to_public(doc: dict) -> ATSScorePublic:
+    return ATSScorePublic(
+        id=str(doc["_id"]),
+        resume_id=doc["resume_id"],
+        job_id=doc["job_id"],
+        overall_score=doc["overall_score"],
+        breakdown=doc["breakdown"],
+        feedback=doc.get("feedback", {}),
+        suggestions=doc.get("suggestions", []),
+        matched_skills=doc.get("matched_skills", []),
+        missing_skills=doc.get("missing_skills", []),
+        degraded=doc.get("degraded", False),
+        created_at=doc["created_at"],
+    )
+
+
+def is_fresh(doc: Optional[dict]) -> bool:
+    # Degraded (rule-based) scores are kept for history but never reused
+    if not doc or doc.get("degraded"):
+        return False
+    return datetime.utcnow() - doc.get("created_at", datetime.min) < SCORE_CACHE_TTL
+
+
+async def find_fresh_score(resume_id: str, job_id: str) -> Optional[dict]:
+    """Return a score for this pair younger than SCORE_CACHE_TTL, if any."""
+    existing = await get_db().ats_scores.find_one(
+        {"resume_id": resume_id, "job_id": job_id, "degraded": {"$ne": True}},
+        sort=[("created_at", -1)],
+    )
+    return existing if is_fresh(existing) else None
+
+
+def github_username(resume: dict) -> Optional[str]:
+    gh_url = resume.get("extracted_links", {}).get("github")
+    return extract_github_username(gh_url) if gh_url else None
+
+
+async def cached_github_score(resume: dict) -> Optional[float]:
+    """GitHub score for blended scoring, only if already analysed."""
+    username = github_username(resume)
+    if not username:
+        return None
+    cached_gh = await get_db().github_analysis.find_one({"username": username})
+    return cached_gh.get("github_score") if cached_gh else None
+
+
+def build_score_doc(resume: dict, job_id: str, llm_result: dict) -> dict:
+    return {
+        "resume_id": str(resume["_id"]),
+        "user_id": resume["user_id"],  # owner, denormalized for score history
+        "job_id": job_id,
+        "overall_score": llm_result.get("overall_score", 0),
+        "breakdown": llm_result.get("breakdown", {}),
+        "feedback": llm_result.get("feedback", {}),
+        "suggestions": llm_result.get("suggestions", []),
+        "matched_skills": llm_result.get("matched_skills", []),
+        "missing_skills": llm_result.get("missing_skills", []),
+        "tokens_used": llm_result.get("tokens_used", 0),
+        "estimated_cost": llm_result.get("estimated_cost", 0.0),
+        "degraded": llm_result.get("degraded", False),
+        "created_at": datetime.utcnow(),
+    }
+
+
+async def score_and_store(
+    resume: dict, job: dict, github_score: Optional[float] = None
+) -> dict:
+    """Score one resume against one job with the LLM and persist the result."""
+    llm_result = await score_resume_with_llm(
+        resume_text=resume.get("parsed_text", ""),
+        job_description=job.get("description", ""),
+        required_skills=job.get("required_skills", []),
+        github_score=github_score,
+    )
+    doc = build_score_doc(resume, str(job["_id"]), llm_result)
+    result = await get_db().ats_scores.insert_one(doc)
+    doc["_id"] = str(result.inserted_id)
+    return doc
+
+
+async def stream_score(resume: dict, job: dict) -> AsyncIterator[tuple[str, Any]]:
+    """Score events for one pair as they become available, ending with
+    ``("done", public_score)`` once the result is persisted.
+
+    A fresh stored score is replayed immediately instead of calling the LLM.
+    """
+    resume_id, job_id = str(resume["_id"]), str(job["_id"])
+    existing = await find_fresh_score(resume_id, job_id)
+    if existing:
+        for event in score_events(existing):
+            yield event
+        yield "done", to_public(existing).model_dump(mode="json")
+        return
+
+    async for event, data in stream_resume_score(
+        resume_text=resume.get("parsed_text", ""),
+        job_description=job.get("description", ""),
+        required_skills=job.get("required_skills", []),
+        github_score=await cached_github_score(resume),
+    ):
+        if event != "result":
+            yield event, data
+            continue
+        doc = build_score_doc(resume, job_id, data)
+        result = await get_db().ats_scores.insert_one(doc)
+        doc["_id"] = result.inserted_id
+        yield "done", to_public(doc).model_dump(mode="json")
+
+
+async def score_batch(
+    job: dict, resume_oids: list[ObjectId], force_refresh: bool = False
+) -> BatchScoreResponse:
+    """Score many resumes against one job and return them ranked.
+
+    Resumes, cached scores and GitHub analyses are each fetched with a single
+    $in query; only pairs without a fresh score reach the LLM (at most
+    BATCH_SCORE_CONCURRENCY at a time) and all new scores are written with
+    one bulk_write.
+    """
+    db = get_db()
+    job_id = str(job["_id"])
+
+    resumes = {
+        str(r["_id"]): r
+        async for r in db.resumes.find(
+            {"_id": {"$in": resume_oids}}, {"user_id": 1, "parsed_text": 1, "extracted_links": 1}
+        )
+    }
+    failed = {str(oid): "Resume not found" for oid in resume_oids if str(oid) not in resumes}
+
+    scores: dict[str, tuple[dict, bool]] = {}
+    if not force_refresh:
+        async for doc in db.ats_scores.find(
+            {"job_id": job_id, "resume_id": {"$in": list(resumes)}}
+        ).sort("created_at", -1):
+            if doc["resume_id"] not in scores and is_fresh(doc):
+                scores[doc["resume_id"]] = (doc, True)
+
+    to_score = [rid for rid in resumes if rid not in scores]
+    usernames = {rid: github_username(resumes[rid]) for rid in to_score}
+    github_scores = {
+        gh["username"]: gh.get("github_score")
+        async for gh in db.github_analysis.find(
+            {"username": {"$in": [u for u in usernames.values() if u]}},
+            {"username": 1, "github_score": 1},
+        )
+    }
+
+    limit = asyncio.Semaphore(settings.BATCH_SCORE_CONCURRENCY)
+
+    async def score_one(rid: str) -> Optional[dict]:
+        resume = resumes[rid]
+        async with limit:
+            try:
+                llm_result = await score_resume_with_llm(
+                    resume_text=resume.get("parsed_text", ""),
+                    job_description=job.get("description", ""),
+                    required_skills=job.get("required_skills", []),
+                    github_score=github_scores.get(usernames[rid]),
+                )
+            except Exception as e:
+                failed[rid] = f"Scoring failed: {e}"
+                return None
+        return build_score_doc(resume, job_id, llm_result)
+
+    new_docs = [doc for doc in await asyncio.gather(*map(score_one, to_score)) if doc]
+    if new_docs:
+        # InsertOne fills in each document's _id, so ids are known afterwards
+        await db.ats_scores.bulk_write([InsertOne(doc) for doc in new_docs], ordered=False)
+        for doc in new_docs:
+            scores[doc["resume_id"]] = (doc, False)
+
+    ordered = sorted(scores.values(), key=lambda item: item[0]["overall_score"], reverse=True)
+    return BatchScoreResponse(
+        job_id=job_id,
+        ranked=[
+            RankedScore(
+                rank=rank,
+                resume_id=doc["resume_id"],
+                score_id=str(doc["_id"]),
+                overall_score=doc["overall_score"],
+                matched_skills=doc.get("matched_skills", []),
+                missing_skills=doc.get("missing_skills", []),
+                cached=cached,
+                degraded=doc.get("degraded", False),
+            )
+            for rank, (doc, cached) in enumerate(ordered, start=1)
+        ],
+        failed=failed,
+        tokens_used=sum(doc.get("tokens_used", 0) for doc in new_docs),
+        estimated_cost=round(sum(doc.get("estimated_cost", 0.0) for doc in new_docs), 6),
+    )
+
+
+async def score_resume_for_jobs(
+    resume: dict, job_oids: list[ObjectId], force_refresh: bool = False
+) -> MultiJobScoreResponse:
+    """Match one resume against many jobs and return them ranked.
+
+    Jobs without a fresh score are packed several to an LLM call (see
+    score_resume_against_jobs), and new scores are written with one bulk_write.
+    """
+    db = get_db()
+    resume_id = str(resume["_id"])
+
+    jobs = {
+        str(j["_id"]): j
+        async for j in db.jobs.find(
+            {"_id": {"$in": job_oids}},
+            {"title": 1, "company": 1, "description": 1, "required_skills": 1},
+        )
+    }
+    failed = {str(oid): "Job not found" for oid in job_oids if str(oid) not in jobs}
+
+    scores: dict[str, tuple[dict, bool]] = {}
+    if not force_refresh:
+        async for doc in db.ats_scores.find(
+            {"resume_id": resume_id, "job_id": {"$in": list(jobs)}}
+        ).sort("created_at", -1):
+            if doc["job_id"] not in scores and is_fresh(doc):
+                scores[doc["job_id"]] = (doc, True)
+
+    to_score = [
+        {
+            "id": jid,
+            "description": jobs[jid].get("description", ""),
+            "required_skills": jobs[jid].get("required_skills", []),
+        }
+        for jid in jobs
+        if jid not in scores
+    ]
+    new_docs = []
+    if to_score:
+        results, errors = await score_resume_against_jobs(
+            resume.get("parsed_text", ""), to_score, await cached_github_score(resume)
+        )
+        failed.update(errors)
+        new_docs = [build_score_doc(resume, jid, result) for jid, result in results.items()]
+    if new_docs:
+        await db.ats_scores.bulk_write([InsertOne(doc) for doc in new_docs], ordered=False)
+        for doc in new_docs:
+            scores[doc["job_id"]] = (doc, False)
+
+    ordered = sorted(scores.values(), key=lambda item: item[0]["overall_score"], reverse=True)
+    return MultiJobScoreResponse(
+        resume_id=resume_id,
+        ranked=[
+            JobMatch(
+                rank=rank,
+                job_id=doc["job_id"],
+                title=jobs[doc["job_id"]].get("title", ""),
+                company=jobs[doc["job_id"]].get("company", ""),
+                score_id=str(doc["_id"]),
+                overall_score=doc["overall_score"],
+                matched_skills=doc.get("matched_skills", []),
+                missing_skills=doc.get("missing_skills", []),
+                cached=cached,
+                degraded=doc.get("degraded", False),
+            )
+            for rank, (doc, cached) in enumerate(ordered, start=1)
+        ],
+        failed=failed,
+        tokens_used=sum(doc.get("tokens_used", 0) for doc in new_docs),
+        estimated_cost=round(sum(doc.get("estimated_cost", 0.0) for doc in new_docs), 6),
+    )
+
+
+async def prerank(jobs: list[dict], resume_oids: list[ObjectId], top_k: int) -> PrerankResponse:
+    """Rule-based skill coverage of every resume against every job, no LLM.
+
+    Meant for cutting a large applicant pool down before LLM scoring; all
+    pairs are scored with one SkillMatrix product.
+    """
+    resume_ids, texts = [], []
+    async for r in get_db().resumes.find({"_id": {"$in": resume_oids}}, {"parsed_text": 1}):
+        resume_ids.append(str(r["_id"]))
+        texts.append(r.get("parsed_text", ""))
+
+    matrix = SkillMatrix(job.get("required_skills", []) for job in jobs)
+    rows = matrix.encode_texts(texts)
+    coverage = matrix.coverage(rows)
+    scores = matrix.rule_based_scores(rows)
+
+    return PrerankResponse(
+        jobs=[
+            JobPrerank(
+                job_id=str(job["_id"]),
+                candidates=[
+                    PrerankCandidate(
+                        resume_id=resume_ids[i],
+                        coverage=round(float(coverage[i, j]), 4),
+                        rule_based_score=int(scores[i, j]),
+                        matched_skills=matrix.matched(rows[i], j),
+                        missing_skills=matrix.missing(rows[i], j),
+                    )
+                    for i in best
+                ],
+            )
+            for j, (job, best) in enumerate(zip(jobs, matrix.top_k(coverage, top_k)))
+        ],
+        resumes_ranked=len(resume_ids),
+    )
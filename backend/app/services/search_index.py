@@ -0,0 +1,134 @@
+import asyncio
+from typing import Optional
+
+from app.database import get_db
+from app.services import skill_index
+from app.services.bm25 import BM25Index
+from app.services.skill_matrix import canonical_skill
+
+LOAD_BATCH = 500  # documents indexed between yields to the event loop
+
+# Full-text BM25 over resumes.parsed_text and active jobs (title, description
+# and required skills). Like the skill index this is per-process and rebuilt
+# from Mongo at startup, but in the background: a large corpus takes seconds
+# to tokenize, so text search answers 503 until it is ready.
+resume_text_index = BM25Index()
+job_text_index = BM25Index()
+_text_ready = False
+_loader: Optional[asyncio.Task] = None
+# Ids written while the loader runs: the live write is newer than whatever
+# the loader's cursor returns for them, so the loader leaves them alone
+_touched_resumes: set[str] = set()
+_touched_jobs: set[str] = set()
+
+
+class SearchIndexLoading(Exception):
+    """Raised by text search while the startup load is still running."""
+
+
+def job_text(job: dict) -> str:
+    return " ".join(
+        [job.get("title", ""), job.get("description", ""), *job.get("required_skills", [])]
+    )
+
+
+def index_resume(resume_id: str, doc: dict):
+    if not _text_ready:
+        _touched_resumes.add(resume_id)
+    skill_index.resume_index.add(resume_id, doc.get("skills", []))
+    resume_text_index.add(resume_id, doc.get("parsed_text") or "")
+
+
+def unindex_resume(resume_id: str):
+    if not _text_ready:
+        _touched_resumes.add(resume_id)
+    skill_index.resume_index.remove(resume_id)
+    resume_text_index.remove(resume_id)
+
+
+def index_job(job_id: str, doc: dict):
+    if not _text_ready:
+        _touched_jobs.add(job_id)
+    if doc.get("status", "active") != "active":
+        unindex_job(job_id)
+        return
+    skill_index.job_index.add(job_id, doc.get("required_skills", []))
+    job_text_index.add(job_id, job_text(doc))
+
+
+def unindex_job(job_id: str):
+    if not _text_ready:
+        _touched_jobs.add(job_id)
+    skill_index.job_index.remove(job_id)
+    job_text_index.remove(job_id)
+
+
+async def _load_text_indexes():
+    global _text_ready
+    db = get_db()
+    n = 0
+    async for r in db.resumes.find({"parsed_text": {"$nin": [None, ""]}}, {"parsed_text": 1}):
+        if str(r["_id"]) not in _touched_resumes:
+            resume_text_index.add(str(r["_id"]), r["parsed_text"])
+        n += 1
+        if n % LOAD_BATCH == 0:
+            await asyncio.sleep(0)
+    async for j in db.jobs.find(
+        {"status": "active"}, {"title": 1, "description": 1, "required_skills": 1}
+    ):
+        if str(j["_id"]) not in _touched_jobs:
+            job_text_index.add(str(j["_id"]), job_text(j))
+    _text_ready = True
+    _touched_resumes.clear()
+    _touched_jobs.clear()
+    print(f"Text index loaded: {len(resume_text_index)} resumes, {len(job_text_index)} jobs")
+
+
+async def start_search_indexes():
+    """Load the skill index, then build the text indexes in the background."""
+    global _loader
+    await skill_index.load_skill_index()
+    _loader = asyncio.create_task(_load_text_indexes())
+
+
+async def stop_search_indexes():
+    if _loader and not _loader.done():
+        _loader.cancel()
+        try:
+            await _loader
+        except asyncio.CancelledError:
+            pass
+
+
+def _split(required: frozenset[str], have: frozenset[str]) -> tuple[list[str], list[str]]:
+    return sorted(required & have), sorted(required - have)
+
+
+def text_resumes_for_job(
+    job: dict, k: int
+) -> list[tuple[str, float, list[str], list[str]]]:
+    """Top ``k`` resumes by BM25 of the job text against resume text.
+
+    Same tuple shape as skill_index.top_resumes_for_job, but the score is an
+    unbounded BM25 relevance rather than a 0-1 coverage.
+    """
+    if not _text_ready:
+        raise SearchIndexLoading()
+    required = frozenset(s for s in map(canonical_skill, job.get("required_skills", [])) if s)
+    return [
+        (resume_id, score, *_split(required, skill_index.resume_index.skills_of(resume_id)))
+        for resume_id, score in resume_text_index.search(job_text(job), k)
+    ]
+
+
+def text_jobs_for_resume(
+    resume: dict, k: int
+) -> list[tuple[str, float, list[str], list[str]]]:
+    """Top ``k`` active jobs by BM25 of the resume text against job text."""
+    if not _text_ready:
+        raise SearchIndexLoading()
+    have = frozenset(s for s in map(canonical_skill, resume.get("skills", [])) if s)
+    return [
+        (job_id, score, *_split(skill_index.job_index.skills_of(job_id), have))
+        for job_id, score in job_text_index.search(resume.get("parsed_text") or "", k)
+    ]
@@ -0,0 +1,157 @@
+import heapq
+import math
+from collections import defaultdict
+from typing import Iterable, Optional
+
+import numpy as np
+
+from app.database import get_db
+from app.services.skill_matrix import canonical_skill
+
+
+class SkillIndex:
+    """Inverted index from canonical skill to the items that have it.
+
+    Items live in integer slots so a posting list can be handed to NumPy as
+    an index array; scoring a query is then one vectorised add per skill.
+    Slots of removed items are reused.
+    """
+
+    def __init__(self):
+        self._slots: dict[str, int] = {}
+        self._ids: list[Optional[str]] = []
+        self._free: list[int] = []
+        self._skills: list[frozenset[str]] = []
+        self._postings: dict[str, set[int]] = defaultdict(set)
+        self._arrays: dict[str, np.ndarray] = {}  # posting lists as arrays, built lazily
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def add(self, item_id: str, skills: Iterable[str]):
+        self.remove(item_id)
+        keys = frozenset(k for k in map(canonical_skill, skills) if k)
+        if not keys:
+            return
+        if self._free:
+            slot = self._free.pop()
+            self._ids[slot], self._skills[slot] = item_id, keys
+        else:
+            slot = len(self._ids)
+            self._ids.append(item_id)
+            self._skills.append(keys)
+        self._slots[item_id] = slot
+        for key in keys:
+            self._postings[key].add(slot)
+            self._arrays.pop(key, None)
+
+    def remove(self, item_id: str):
+        slot = self._slots.pop(item_id, None)
+        if slot is None:
+            return
+        for key in self._skills[slot]:
+            posting = self._postings[key]
+            posting.discard(slot)
+            if not posting:
+                del self._postings[key]
+            self._arrays.pop(key, None)
+        self._ids[slot], self._skills[slot] = None, frozenset()
+        self._free.append(slot)
+
+    def skills_of(self, item_id: str) -> frozenset[str]:
+        slot = self._slots.get(item_id)
+        return self._skills[slot] if slot is not None else frozenset()
+
+    def df(self, skill: str) -> int:
+        return len(self._postings.get(skill, ()))
+
+    def _array(self, skill: str) -> np.ndarray:
+        array = self._arrays.get(skill)
+        if array is None:
+            array = self._arrays[skill] = np.fromiter(
+                self._postings.get(skill, ()), dtype=np.intp
+            )
+        return array
+
+    def top(self, weights: dict[str, float], k: int) -> list[tuple[str, float]]:
+        """The ``k`` items with the highest summed weight of matching skills."""
+        scores = np.zeros(len(self._ids), dtype=np.float64)
+        for skill, weight in weights.items():
+            scores[self._array(skill)] += weight
+        hits = np.flatnonzero(scores)
+        if len(hits) > k:
+            hits = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+        hits = hits[np.argsort(-scores[hits], kind="stable")]
+        return [(self._ids[slot], float(scores[slot])) for slot in hits]
+
+    def overlapping(self, skills: Iterable[str]) -> set[str]:
+        """Ids of items sharing at least one skill."""
+        slots: set[int] = set()
+        for skill in skills:
+            slots |= self._postings.get(skill, set())
+        return {self._ids[slot] for slot in slots}
+
+
+# Resumes and active jobs, filled by load_skill_index(), which main.lifespan
+# awaits before serving, and kept current through search_index's hooks on
+# the write paths. Each worker process holds its own copy; Mongo (multikey
+# indexes on resumes.skills and jobs.required_skills) remains the source of
+# truth.
+resume_index = SkillIndex()
+job_index = SkillIndex()
+
+
+async def load_skill_index():
+    db = get_db()
+    async for r in db.resumes.find({"skills.0": {"$exists": True}}, {"skills": 1}):
+        resume_index.add(str(r["_id"]), r["skills"])
+    async for j in db.jobs.find({"status": "active"}, {"required_skills": 1}):
+        job_index.add(str(j["_id"]), j.get("required_skills", []))
+    print(f"Skill index loaded: {len(resume_index)} resumes, {len(job_index)} jobs")
+
+
+def skill_weight(skill: str) -> float:
+    """IDF over the resume pool: a match on a rare skill counts for more."""
+    return math.log(1 + (len(resume_index) + 1) / (resume_index.df(skill) + 1))
+
+
+async def top_resumes_for_job(
+    required_skills: list[str], k: int
+) -> list[tuple[str, float, list[str], list[str]]]:
+    """Top ``k`` resumes by IDF-weighted share of the job's skills they have.
+
+    Returns ``(resume_id, score, matched, missing)`` with score in [0, 1].
+    """
+    skills = {s for s in map(canonical_skill, required_skills) if s}
+    if not skills:
+        return []
+    weights = {s: skill_weight(s) for s in skills}
+    total = sum(weights.values())
+    results = []
+    for resume_id, score in resume_index.top(weights, k):
+        have = resume_index.skills_of(resume_id)
+        results.append(
+            (resume_id, score / total, sorted(skills & have), sorted(skills - have))
+        )
+    return results
+
+
+async def top_jobs_for_resume(
+    skills: list[str], k: int
+) -> list[tuple[str, float, list[str], list[str]]]:
+    """Top ``k`` active jobs by IDF-weighted share of their required skills
+    this resume covers. Same tuple shape as top_resumes_for_job."""
+    have = {s for s in map(canonical_skill, skills) if s}
+    if not have:
+        return []
+    scored = []
+    for job_id in job_index.overlapping(have):
+        required = job_index.skills_of(job_id)
+        weights = {s: skill_weight(s) for s in required}
+        scored.append((job_id, sum(weights[s] for s in required & have) / sum(weights.values())))
+
+    results = []
+    for job_id, score in heapq.nlargest(k, scored, key=lambda item: item[1]):
+        required = job_index.skills_of(job_id)
+        results.append((job_id, score, sorted(required & have), sorted(required - have)))
+    return results
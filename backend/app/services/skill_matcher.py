@@ -0,0 +1,99 @@
+import re
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+
+@dataclass
+class SkillMatch:
+    skill: str
+    count: int = 0
+    positions: list[tuple[int, int]] = field(default_factory=list)
+
+
+def _build_trie(terms: Iterable[str]) -> dict:
+    trie: dict = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = True
+    return trie
+
+
+def _trie_to_pattern(node: dict) -> str:
+    """Turn a character trie into a prefix-factored regex.
+
+    Python's ``re`` tries alternatives one by one, so a flat ``a|b|c`` union of
+    thousands of skills is still O(skills) per position. Factoring shared
+    prefixes keeps the work per position bounded by the longest skill.
+    """
+    is_end = "" in node
+    branches = [
+        re.escape(ch) + _trie_to_pattern(child)
+        for ch, child in sorted(node.items())
+        if ch
+    ]
+    if not branches:
+        return ""
+    if len(branches) == 1 and not is_end:
+        return branches[0]
+    group = "(?:" + "|".join(branches) + ")"
+    return group + "?" if is_end else group
+
+
+class SkillMatcher:
+    """Find every taxonomy skill (and its aliases) in a single regex pass."""
+
+    def __init__(self, skills: Iterable[str], aliases: Optional[dict[str, str]] = None):
+        self._canonical: dict[str, str] = {}
+        for skill in skills:
+            self._canonical[skill.lower()] = skill
+        for alias, skill in (aliases or {}).items():
+            canonical = self._canonical.get(skill.lower())
+            if canonical is not None:
+                self._canonical.setdefault(alias.lower(), canonical)
+
+        body = _trie_to_pattern(_build_trie(self._canonical)) or "(?!)"
+        # Skills such as "c++" or "node.js" end in punctuation, so \b is not a
+        # usable boundary; require the neighbours to be non-word characters.
+        self._pattern = re.compile(rf"(?<!\w)(?:{body})(?!\w)", re.IGNORECASE)
+        # Spellings the regex matches case-insensitively but str.lower() does
+        # not map back to a key (e.g. "GİT", "ruſt"), resolved once each
+        self._variants: dict[str, Optional[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._canonical)
+
+    def find(self, text: str) -> dict[str, SkillMatch]:
+        """Return match counts and (start, end) spans keyed by canonical skill."""
+        matches: dict[str, SkillMatch] = {}
+        for m in self._pattern.finditer(text):
+            skill = self._lookup(m.group())
+            if skill is None:
+                continue
+            entry = matches.get(skill)
+            if entry is None:
+                entry = matches[skill] = SkillMatch(skill=skill)
+            entry.count += 1
+            entry.positions.append(m.span())
+        return matches
+
+    def _lookup(self, matched: str) -> Optional[str]:
+        skill = self._canonical.get(matched.lower())
+        if skill is not None:
+            return skill
+        if matched not in self._variants:
+            # Same case-insensitive comparison the regex made
+            self._variants[matched] = next(
+                (
+                    canonical
+                    for key, canonical in self._canonical.items()
+                    if re.fullmatch(re.escape(key), matched, re.IGNORECASE)
+                ),
+                None,
+            )
+        return self._variants[matched]
+
+    def skills(self, text: str) -> list[str]:
+        """Return distinct canonical skills in order of first appearance."""
+        return list(self.find(text))
@@ -0,0 +1,100 @@
+from typing import Iterable
+
+import numpy as np
+
+from app.services.resume_parser import SKILL_ALIASES
+from app.services.skill_matcher import SkillMatcher
+
+
+def canonical_skill(skill: str) -> str:
+    key = skill.strip().lower()
+    return SKILL_ALIASES.get(key, key)
+
+
+class SkillMatrix:
+    """Rule-based skill coverage for every resume x job pair at once.
+
+    The vocabulary is the union of the jobs' required skills only (resume
+    skills no job asks for cannot change coverage), so matrices stay narrow.
+    Jobs and resumes are 0/1 rows over that vocabulary and the match counts
+    for all pairs are a single matrix product.
+    """
+
+    def __init__(self, job_skills: Iterable[list[str]]):
+        self.vocab: list[str] = []
+        self.labels: list[str] = []  # first spelling seen, for display
+        self.index: dict[str, int] = {}
+        rows = []
+        for skills in job_skills:
+            row = []
+            for skill in skills:
+                key = canonical_skill(skill)
+                if not key:
+                    continue
+                if key not in self.index:
+                    self.index[key] = len(self.vocab)
+                    self.vocab.append(key)
+                    self.labels.append(skill.strip())
+                row.append(self.index[key])
+            rows.append(row)
+
+        self.jobs = np.zeros((len(rows), len(self.vocab)), dtype=np.float32)
+        for j, row in enumerate(rows):
+            self.jobs[j, row] = 1.0
+        self.job_sizes = self.jobs.sum(axis=1)
+        # Lower-cased spelling (canonical or alias) -> vocabulary column
+        self._lookup = dict(self.index)
+        for alias, skill in SKILL_ALIASES.items():
+            if skill in self.index:
+                self._lookup.setdefault(alias, self.index[skill])
+        self._matcher = SkillMatcher(self.vocab, SKILL_ALIASES)
+
+    def encode_skills(self, skill_lists: Iterable[list[str]]) -> np.ndarray:
+        """Rows for already-extracted skill lists (e.g. ``resumes.skills``)."""
+        lookup = self._lookup
+        row_idx: list[int] = []
+        col_idx: list[int] = []
+        n = 0
+        for n, skills in enumerate(skill_lists, 1):
+            for skill in skills:
+                col = lookup.get(skill.strip().lower())
+                if col is not None:
+                    row_idx.append(n - 1)
+                    col_idx.append(col)
+        matrix = np.zeros((n, len(self.vocab)), dtype=np.float32)
+        matrix[row_idx, col_idx] = 1.0
+        return matrix
+
+    def encode_texts(self, texts: Iterable[str]) -> np.ndarray:
+        """Rows for raw resume text, matching the vocabulary (and aliases)
+        on word boundaries in one regex pass per resume."""
+        return self.encode_skills(self._matcher.skills(text) for text in texts)
+
+    def match_counts(self, resumes: np.ndarray) -> np.ndarray:
+        """(resumes x jobs) number of required skills each resume has."""
+        return resumes @ self.jobs.T
+
+    def coverage(self, resumes: np.ndarray) -> np.ndarray:
+        """(resumes x jobs) fraction of each job's required skills matched."""
+        return self.match_counts(resumes) / np.maximum(self.job_sizes, 1.0)
+
+    def rule_based_scores(self, resumes: np.ndarray) -> np.ndarray:
+        """Same scale as llm_service._rule_based_score: coverage x 80, rounded."""
+        return np.rint(self.coverage(resumes) * 80).astype(np.int32)
+
+    def top_k(self, scores: np.ndarray, k: int) -> np.ndarray:
+        """(jobs x k) resume row indexes, best first, for every job."""
+        k = min(k, scores.shape[0])
+        if k == 0:
+            return np.empty((scores.shape[1], 0), dtype=np.intp)
+        part = np.argpartition(-scores, k - 1, axis=0)[:k].T
+        order = np.take_along_axis(scores.T, part, axis=1).argsort(axis=1, kind="stable")[:, ::-1]
+        return np.take_along_axis(part, order, axis=1)
+
+    def matched(self, resume_row: np.ndarray, job: int) -> list[str]:
+        hits = np.flatnonzero((resume_row > 0) & (self.jobs[job] > 0))
+        return [self.labels[i] for i in hits]
+
+    def missing(self, resume_row: np.ndarray, job: int) -> list[str]:
+        gaps = np.flatnonzero((resume_row == 0) & (self.jobs[job] > 0))
+        return [self.labels[i] for i in gaps]
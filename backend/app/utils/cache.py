@@ -0,0 +1,55 @@
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+from app.database import get_db
+from app.utils.metrics import CACHE_REQUESTS
+
+
+class TieredCache:
+    """In-process LRU in front of a Mongo collection keyed by ``_id``.
+
+    Expiry of the Mongo tier is left to a TTL index on ``created_at``; the
+    LRU tier only bounds memory.
+    """
+
+    def __init__(self, collection: str, max_entries: int):
+        self.collection = collection
+        self.max_entries = max_entries
+        self._lru: "OrderedDict[str, dict]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _remember(self, key: str, value: dict):
+        self._lru[key] = value
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[dict]:
+        value = self._lru.get(key)
+        if value is not None:
+            self._lru.move_to_end(key)
+            self.hits += 1
+            CACHE_REQUESTS.inc(self.collection, "memory_hit")
+            return dict(value)
+
+        doc = await get_db()[self.collection].find_one({"_id": key})
+        if not doc or doc.get("value") is None:
+            self.misses += 1
+            CACHE_REQUESTS.inc(self.collection, "miss")
+            return None
+        self.hits += 1
+        CACHE_REQUESTS.inc(self.collection, "mongo_hit")
+        self._remember(key, doc["value"])
+        return dict(doc["value"])
+
+    async def set(self, key: str, value: dict):
+        # Copy in as well as out: callers go on to mutate the dict they stored
+        value = dict(value)
+        self._remember(key, value)
+        await get_db()[self.collection].update_one(
+            {"_id": key},
+            {"$set": {"value": value, "created_at": datetime.utcnow()}},
+            upsert=True,
+        )
@@ -0,0 +1,49 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+
+from bson import ObjectId
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(doc: dict, field: str) -> str:
+    """Opaque cursor for the page after ``doc`` in a (field desc, _id desc) sort."""
+    raw = json.dumps([doc[field].isoformat(), str(doc["_id"])])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, ObjectId]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, doc_id = json.loads(raw)
+        return datetime.fromisoformat(value), ObjectId(doc_id)
+    except Exception:
+        raise InvalidCursor("Invalid cursor")
+
+
+def after(cursor: str, field: str) -> dict:
+    """Filter for documents strictly after the cursor in (field, _id) desc order."""
+    value, last_id = decode_cursor(cursor)
+    return {
+        "$or": [
+            {field: {"$lt": value}},
+            {field: value, "_id": {"$lt": last_id}},
+        ]
+    }
+
+
+def sort_spec(field: str) -> list[tuple[str, int]]:
+    return [(field, -1), ("_id", -1)]
+
+
+async def fetch_page(cursor, limit: int, field: str) -> tuple[list[dict], Optional[str]]:
+    """Read ``limit`` documents from a cursor already sorted by sort_spec(field)
+    and limited to ``limit + 1``; returns them and the next cursor, if any."""
+    docs = [d async for d in cursor]
+    if len(docs) > limit:
+        return docs[:limit], encode_cursor(docs[limit - 1], field)
+    return docs, None
@@ -0,0 +1,148 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+Recording is a dict lookup plus an add (histograms also bisect a short
+bucket list) and takes no locks. Almost everything is recorded on the event
+loop; Mongo command events arrive on Motor's driver threads, where the GIL
+makes a lost update possible but rare enough not to matter for monitoring.
+"""
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Iterator
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_registry: list["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        _registry.append(self)
+
+    def _label_str(self, values: tuple, extra: str = "") -> str:
+        pairs = [f'{k}="{_escape(str(v))}"' for k, v in zip(self.labels, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *label_values, amount: float = 1):
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        for values, total in sorted(self._values.items()):
+            lines.append(f"{self.name}{self._label_str(values)} {total:g}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = buckets
+        # Per label set: [count per bucket..., +Inf count, sum]
+        self._values: dict[tuple, list[float]] = {}
+
+    def observe(self, value: float, *label_values):
+        series = self._values.get(label_values)
+        if series is None:
+            series = self._values[label_values] = [0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    @contextmanager
+    def time(self, *label_values) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        for values, series in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                labels = self._label_str(values, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative:g}")
+            lines.append(f"{self.name}_sum{self._label_str(values)} {series[-1]:g}")
+            lines.append(f"{self.name}_count{self._label_str(values)} {cumulative:g}")
+        return lines
+
+
+def render() -> str:
+    lines: list[str] = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+LLM_LATENCY = Histogram(
+    "ats_llm_request_seconds", "Cerebras completion time, including generation", ("mode",)
+)
+UPSTREAM_LATENCY = Histogram(
+    "ats_upstream_response_seconds", "Time to upstream response headers", ("upstream",)
+)
+UPSTREAM_RESPONSES = Counter(
+    "ats_upstream_responses_total", "Upstream HTTP responses by status code", ("upstream", "status")
+)
+PARSE_LATENCY = Histogram(
+    "ats_resume_parse_seconds", "Resume parse time, including queueing in the pool", ("format",)
+)
+MONGO_LATENCY = Histogram(
+    "ats_mongo_command_seconds", "MongoDB command round-trip time", ("command",)
+)
+MONGO_FAILURES = Counter(
+    "ats_mongo_command_failures_total", "Failed MongoDB commands", ("command",)
+)
+LLM_TOKENS = Counter("ats_llm_tokens_total", "Tokens billed by the LLM provider")
+CACHE_REQUESTS = Counter(
+    "ats_cache_requests_total", "Cache lookups by tier outcome", ("cache", "result")
+)
+RULE_BASED_FALLBACKS = Counter(
+    "ats_rule_based_fallbacks_total", "Scores produced by _rule_based_score", ("reason",)
+)
+UPSTREAM_RETRIES = Counter(
+    "ats_upstream_retries_total", "Retried upstream attempts by cause", ("upstream", "cause")
+)
+PASSWORD_HASH_LATENCY = Histogram(
+    "ats_password_hash_seconds", "bcrypt time in the hashing pool", ("op",)
+)
+PASSWORD_HASH_WAIT = Histogram(
+    "ats_password_hash_wait_seconds", "Time queued for a hashing worker", ("op",)
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "ats_password_hash_rejected_total", "Hashing requests refused with the queue full", ("op",)
+)
+BREAKER_OPENED = Counter(
+    "ats_circuit_breaker_opened_total", "Times a circuit breaker tripped", ("upstream",)
+)
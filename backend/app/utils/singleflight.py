@@ -0,0 +1,51 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+_groups: dict[str, "SingleFlight"] = {}
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key onto one in-flight task.
+
+    The first caller for a key starts the upstream call; callers arriving
+    while it is running await the same task instead of starting their own.
+    The task is shielded, so a cancelled waiter never cancels the call the
+    others are waiting on.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._in_flight: dict[str, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+        _groups[name] = self
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> tuple[Any, bool]:
+        """Return ``(result, shared)``; ``shared`` is True for coalesced callers."""
+        task = self._in_flight.get(key)
+        shared = task is not None
+        if shared:
+            self.coalesced += 1
+        else:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        return await asyncio.shield(task), shared
+
+    def _forget(self, key: str, task: asyncio.Task):
+        self._in_flight.pop(key, None)
+        # Mark the exception retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+        }
+
+
+def coalescing_stats() -> dict:
+    return {name: group.stats() for name, group in _groups.items()}
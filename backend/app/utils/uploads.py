@@ -0,0 +1,285 @@
+import hashlib
+import io
+import os
+from tempfile import NamedTemporaryFile
+from typing import Optional, Union
+
+from fastapi import HTTPException, Request
+from multipart.multipart import MultipartParser, parse_options_header
+
+SPOOL_MEMORY_LIMIT = 512 * 1024  # roll over to disk beyond this
+SNIFF_BYTES = 1024  # PDF allows junk before the %PDF- header within the first 1 KB
+
+# Leading bytes each allowed extension must start with
+MAGIC_BYTES = {
+    ".pdf": (b"%PDF-",),
+    ".docx": (b"PK\x03\x04",),
+    ".doc": (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", b"PK\x03\x04"),
+    ".zip": (b"PK\x03\x04", b"PK\x05\x06"),
+}
+
+# OpenAPI body for endpoints that read the multipart stream themselves
+UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                }
+            }
+        },
+    }
+}
+
+BULK_UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["files"],
+                    "properties": {
+                        "files": {
+                            "type": "array",
+                            "items": {"type": "string", "format": "binary"},
+                            "description": "Resumes (PDF/DOCX) and/or ZIP archives of resumes",
+                        }
+                    },
+                }
+            }
+        },
+    }
+}
+
+
+def magic_matches(ext: str, head: bytes) -> bool:
+    if ext == ".pdf":
+        return b"%PDF-" in head[:SNIFF_BYTES]
+    return any(head.startswith(magic) for magic in MAGIC_BYTES.get(ext, ()))
+
+
+class UploadSink:
+    """Spool one uploaded file chunk by chunk.
+
+    Size, content hash and magic bytes are all checked as data arrives, so an
+    oversized or mislabeled file is rejected without ever being held in full.
+    Past SPOOL_MEMORY_LIMIT the data moves to a named temp file, so a parse
+    worker can read it from ``path`` instead of being sent a copy.
+    """
+
+    def __init__(self, filename: str, max_size: int):
+        self.filename = filename
+        self.ext = os.path.splitext(filename)[1].lower()
+        self.max_size = max_size
+        self.size = 0
+        self.file = io.BytesIO()
+        self.path: Optional[str] = None
+        self._hash = hashlib.sha256()
+        self._head = b""
+        self._sniffed = False
+        self.error: Optional[str] = None  # set instead of raising in batch mode
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    def write(self, chunk: bytes):
+        self.size += len(chunk)
+        if self.size > self.max_size:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File size exceeds {self.max_size // (1024 * 1024)}MB limit.",
+            )
+        if not self._sniffed:
+            self._head += chunk[: SNIFF_BYTES - len(self._head)]
+            if len(self._head) >= SNIFF_BYTES:
+                self._check_magic()
+        self._hash.update(chunk)
+        if self.path is None and self.size > SPOOL_MEMORY_LIMIT:
+            self._rollover()
+        self.file.write(chunk)
+
+    def _rollover(self):
+        spooled = NamedTemporaryFile(suffix=self.ext, delete=False)
+        spooled.write(self.file.getvalue())
+        self.file = spooled
+        self.path = spooled.name
+
+    def finish(self):
+        if not self._sniffed:
+            self._check_magic()
+        self.file.seek(0)
+
+    def _check_magic(self):
+        self._sniffed = True
+        if not magic_matches(self.ext, self._head):
+            raise HTTPException(
+                status_code=400,
+                detail=f"File content does not match its {self.ext} extension.",
+            )
+
+    def read_bytes(self) -> bytes:
+        self.file.seek(0)
+        return self.file.read()
+
+    def parse_source(self) -> Union[bytes, str]:
+        """What to hand the parse pool: the file's path once it is on disk,
+        otherwise its (small) in-memory bytes. Keep the sink open until the
+        parse is done."""
+        return self.path or self.read_bytes()
+
+    def close(self):
+        self.file.close()
+        if self.path:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+
+
+async def receive_upload(
+    request: Request,
+    max_size: int,
+    allowed_extensions: set[str],
+    field_name: str = "file",
+) -> UploadSink:
+    """Stream a single-file multipart request body into an UploadSink."""
+    content_length_guard(request, max_size + 64 * 1024)
+    sinks = await receive_uploads(request, max_size, allowed_extensions, field_name)
+    return sinks[0]
+
+
+def content_length_guard(request: Request, limit: int):
+    # Cheap early rejection; the streamed byte count is the real guard
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > limit:
+        raise HTTPException(
+            status_code=413, detail="Upload exceeds the allowed request size."
+        )
+
+
+async def receive_uploads(
+    request: Request,
+    max_size: int,
+    allowed_extensions: set[str],
+    field_name: str = "file",
+    max_files: int = 1,
+    strict: bool = True,
+    archive_max_size: Optional[int] = None,
+    max_total: Optional[int] = None,
+) -> list[UploadSink]:
+    """Stream every ``field_name`` file part of a multipart body to disk.
+
+    In strict mode the first bad file aborts the request with an HTTP error.
+    Otherwise the offending file is dropped, its reason kept on ``sink.error``
+    and the rest of the body is still read, so batch callers can report
+    per-file outcomes. ``.zip`` parts are limited by ``archive_max_size``
+    and the whole body by ``max_total``, which always aborts the request.
+    """
+    if max_total:
+        content_length_guard(request, max_total)
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload.")
+
+    sinks: list[UploadSink] = []
+    state = {"sink": None, "header": b"", "value": b"", "disposition": b""}
+
+    def reject(sink: UploadSink, exc: HTTPException):
+        state["sink"] = None
+        sink.close()
+        if strict:
+            raise exc
+        sink.error = exc.detail
+
+    def on_part_begin():
+        state["sink"] = None
+        state["disposition"] = b""
+
+    def on_header_field(data, start, end):
+        state["header"] += data[start:end]
+
+    def on_header_value(data, start, end):
+        state["value"] += data[start:end]
+
+    def on_header_end():
+        if state["header"].lower() == b"content-disposition":
+            state["disposition"] = state["value"]
+        state["header"] = b""
+        state["value"] = b""
+
+    def on_headers_finished():
+        _, options = parse_options_header(state["disposition"])
+        if options.get(b"name") != field_name.encode():
+            return
+        if len(sinks) >= max_files:
+            raise HTTPException(
+                status_code=400, detail=f"At most {max_files} file(s) per request."
+            )
+        filename = options.get(b"filename", b"").decode("utf-8", "replace")
+        ext = os.path.splitext(filename)[1].lower()
+        limit = archive_max_size if ext == ".zip" and archive_max_size else max_size
+        sink = UploadSink(filename, limit)
+        sinks.append(sink)
+        if ext not in allowed_extensions:
+            reject(sink, HTTPException(
+                status_code=400,
+                detail="Unsupported file type. Only PDF and DOCX are allowed.",
+            ))
+            return
+        state["sink"] = sink
+
+    def on_part_data(data, start, end):
+        sink = state["sink"]
+        if sink is not None:
+            try:
+                sink.write(data[start:end])
+            except HTTPException as e:
+                reject(sink, e)
+
+    def on_part_end():
+        sink = state["sink"]
+        if sink is not None:
+            try:
+                sink.finish()
+            except HTTPException as e:
+                reject(sink, e)
+            state["sink"] = None
+
+    parser = MultipartParser(
+        params[b"boundary"],
+        {
+            "on_part_begin": on_part_begin,
+            "on_part_data": on_part_data,
+            "on_part_end": on_part_end,
+            "on_header_field": on_header_field,
+            "on_header_value": on_header_value,
+            "on_header_end": on_header_end,
+            "on_headers_finished": on_headers_finished,
+        },
+    )
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if max_total and received > max_total:
+                raise HTTPException(
+                    status_code=413, detail="Upload exceeds the allowed request size."
+                )
+            parser.write(chunk)
+        parser.finalize()
+    except Exception as e:
+        for sink in sinks:
+            sink.close()
+        if isinstance(e, HTTPException):
+            raise
+        raise HTTPException(status_code=400, detail="Malformed multipart upload.")
+
+    if not sinks:
+        raise HTTPException(status_code=400, detail="No file was uploaded.")
+    return sinks
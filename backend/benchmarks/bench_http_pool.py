@@ -0,0 +1,130 @@
+"""Per-call AsyncClient vs the shared keep-alive pool, against a local TLS stub.
+
+The stub answers like the Cerebras chat endpoint, so the timings isolate
+connection setup (TCP + TLS handshake) from upstream latency.
+
+Run from ``backend/``:  python -m benchmarks.bench_http_pool
+"""
+import asyncio
+import datetime
+import ssl
+import statistics
+import tempfile
+import time
+
+import httpx
+
+from app.config import settings
+from app.services.http_clients import _build_client
+
+CALLS = 400
+CONCURRENCY = 8
+BODY = (
+    b'{"choices":[{"message":{"content":"{\\"overall_score\\": 70}"}}],'
+    b'"usage":{"total_tokens":900}}'
+)
+
+
+def _self_signed_context() -> ssl.SSLContext:
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.utcnow()
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    with tempfile.NamedTemporaryFile(suffix=".pem") as pem:
+        pem.write(key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ))
+        pem.write(cert.public_bytes(serialization.Encoding.PEM))
+        pem.flush()
+        ctx = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        ctx.load_cert_chain(pem.name)
+    return ctx
+
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Minimal HTTP/1.1 keep-alive responder."""
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                b"Content-Length: %d\r\n\r\n" % len(BODY) + BODY
+            )
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _measure(call) -> list[float]:
+    latencies: list[float] = []
+    sem = asyncio.Semaphore(CONCURRENCY)
+
+    async def one():
+        async with sem:
+            start = time.perf_counter()
+            await call()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(CALLS)))
+    return latencies
+
+
+def _report(label: str, latencies: list[float]):
+    q = statistics.quantiles(latencies, n=100)
+    print(f"{label:<24} p50 {q[49]:7.2f} ms   p99 {q[98]:7.2f} ms")
+
+
+async def main():
+    server = await asyncio.start_server(_handle, "127.0.0.1", 0, ssl=_self_signed_context())
+    port = server.sockets[0].getsockname()[1]
+    base_url = f"https://127.0.0.1:{port}"
+    payload = {"model": "stub", "messages": [{"role": "user", "content": "x" * 4000}]}
+
+    async def per_call_client():
+        async with httpx.AsyncClient(timeout=60, verify=False) as client:
+            (await client.post(f"{base_url}/v1/chat/completions", json=payload)).json()
+
+    shared = _build_client(
+        "bench", base_url, settings.CEREBRAS_MAX_CONNECTIONS,
+        settings.CEREBRAS_MAX_KEEPALIVE, settings.CEREBRAS_READ_TIMEOUT,
+    )
+    shared._transport._pool._ssl_context.check_hostname = False
+    shared._transport._pool._ssl_context.verify_mode = ssl.CERT_NONE
+
+    async def pooled_client():
+        (await shared.post("/v1/chat/completions", json=payload)).json()
+
+    print(f"{CALLS} calls, concurrency {CONCURRENCY}, TLS stub on :{port}")
+    _report("new client per call", await _measure(per_call_client))
+    _report("shared pooled client", await _measure(pooled_client))
+
+    await shared.aclose()
+    server.close()
+    await server.wait_closed()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
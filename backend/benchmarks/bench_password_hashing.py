@@ -0,0 +1,110 @@
+"""Latency of an unrelated endpoint (GET /health) during a login storm.
+
+Three runs: no logins, a storm with bcrypt called inline on the event loop
+(the old behaviour), and the same storm through the password hashing pool.
+The app runs in-process over ASGI with a stub users collection, so the
+only real work in a login is bcrypt.
+
+Run from ``backend/``:  python -m benchmarks.bench_password_hashing
+"""
+import asyncio
+import time
+from datetime import datetime
+
+import httpx
+from bson import ObjectId
+
+from app import database
+from app.main import app
+from app.services import auth, password_pool
+
+LOGINS = 40
+LOGIN_CONCURRENCY = 20
+PROBE_INTERVAL = 0.01
+ROUNDS = 10  # cheaper than production so the inline run finishes quickly
+
+auth.pwd_context.update(bcrypt__rounds=ROUNDS)
+_USER = {
+    "_id": ObjectId(), "email": "storm@example.com", "full_name": "Storm",
+    "role": "student", "is_active": True, "created_at": datetime.utcnow(),
+    "password_hash": auth.pwd_context.hash("hunter22"),
+}
+
+
+class _Users:
+    async def find_one(self, query):
+        return dict(_USER)
+
+
+class _StubDB:
+    users = _Users()
+
+
+def _pct(values: list[float], p: int) -> float:
+    # Nearest-rank; a blocked loop may leave only a handful of probes
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, len(ordered) * p // 100)]
+
+
+async def _inline(op, fn, *args):
+    return fn(*args)
+
+
+async def _run(label: str, client: httpx.AsyncClient, logins: int):
+    latencies: list[float] = []
+    storm_done = asyncio.Event()
+
+    async def probe():
+        # Timed from when each probe was due, so a stalled event loop that
+        # cannot even send it on schedule counts against it
+        while not storm_done.is_set():
+            due = time.perf_counter() + PROBE_INTERVAL
+            await asyncio.sleep(PROBE_INTERVAL)
+            r = await client.get("/health")
+            latencies.append((time.perf_counter() - due) * 1000)
+            assert r.status_code == 200
+
+    async def storm():
+        sem = asyncio.Semaphore(LOGIN_CONCURRENCY)
+
+        async def one():
+            async with sem:
+                r = await client.post(
+                    "/api/v1/auth/login",
+                    json={"email": _USER["email"], "password": "hunter22"},
+                )
+                assert r.status_code == 200, r.text
+
+        if logins:
+            await asyncio.gather(*(one() for _ in range(logins)))
+        else:
+            await asyncio.sleep(2)
+        storm_done.set()
+
+    start = time.perf_counter()
+    await asyncio.gather(probe(), storm())
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<22} /health p50 {_pct(latencies, 50):7.2f} ms   "
+        f"p99 {_pct(latencies, 99):7.2f} ms   "
+        f"max {max(latencies):7.2f} ms   ({len(latencies)} probes, {elapsed:.1f} s)"
+    )
+
+
+async def main():
+    database.db = _StubDB()
+    password_pool.start_password_pool()
+    transport = httpx.ASGITransport(app=app)
+    print(f"{LOGINS} logins at concurrency {LOGIN_CONCURRENCY}, bcrypt rounds {ROUNDS}")
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await _run("idle", client, 0)
+        pooled = auth.run_hashing
+        auth.run_hashing = _inline
+        await _run("storm, inline bcrypt", client, LOGINS)
+        auth.run_hashing = pooled
+        await _run("storm, hashing pool", client, LOGINS)
+    password_pool.stop_password_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,137 @@
+"""PDF text extraction: pdfplumber-everything vs the tiered extractor.
+
+Builds a small synthetic corpus (single-column, two-column, table-heavy and a
+long CV) so the benchmark runs without fixture files.
+
+Run from ``backend/``:  python -m benchmarks.bench_pdf_extraction
+"""
+import io
+import random
+import time
+
+from app.services import pdf_extractor
+
+ROUNDS = 5
+WORDS = (
+    "python fastapi docker kubernetes led team built scalable services "
+    "improved latency reduced cost designed pipelines mongodb react aws "
+    "mentored engineers shipped features analytics dashboards testing"
+).split()
+
+
+def _pdf(pages: list[list[tuple[float, float, str]]], lines: list[list[tuple]] = ()) -> bytes:
+    """Write a minimal PDF with Helvetica text runs and optional ruling lines."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in below
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for i, runs in enumerate(pages):
+        ops = ["BT /F1 9 Tf"]
+        for x, y, text in runs:
+            text = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            ops.append(f"1 0 0 1 {x:.1f} {y:.1f} Tm ({text}) Tj")
+        ops.append("ET")
+        for x1, y1, x2, y2 in (lines[i] if i < len(lines) else []):
+            ops.append(f"{x1} {y1} m {x2} {y2} l S")
+        stream = "\n".join(ops).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_ref
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids), len(kids)
+    )
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for n, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % n + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for off in offsets:
+        out.write(b"%010d 00000 n \n" % off)
+    out.write(
+        b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+        % (len(objects) + 1, xref)
+    )
+    return out.getvalue()
+
+
+def _sentence(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def single_column(rng, pages=2):
+    return _pdf([
+        [(50, 750 - 14 * i, _sentence(rng, 14)) for i in range(50)]
+        for _ in range(pages)
+    ])
+
+
+def two_column(rng, pages=2):
+    return _pdf([
+        [(50, 750 - 14 * i, _sentence(rng, 6)) for i in range(50)]
+        + [(320, 750 - 14 * i, _sentence(rng, 6)) for i in range(50)]
+        for _ in range(pages)
+    ])
+
+
+def table_heavy(rng, pages=3):
+    runs, rules = [], []
+    for _ in range(pages):
+        page_runs, page_rules = [], []
+        for row in range(40):
+            y = 750 - 18 * row
+            for col in range(5):
+                page_runs.append((52 + 110 * col, y + 4, _sentence(rng, 2)))
+            page_rules.append((50, y, 600, y))
+        for col in range(6):
+            page_rules.append((50 + 110 * col, 750 - 18 * 39, 50 + 110 * col, 768))
+        runs.append(page_runs)
+        rules.append(page_rules)
+    return _pdf(runs, rules)
+
+
+def _legacy(file_bytes: bytes) -> str:
+    import pdfplumber
+    text = ""
+    with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            if page_text:
+                text += page_text + "\n"
+    return text.strip()
+
+
+def _ms_per_doc(fn, docs) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for doc in docs:
+            fn(doc)
+    return (time.perf_counter() - start) * 1000 / (ROUNDS * len(docs))
+
+
+def main():
+    rng = random.Random(7)
+    corpus = {
+        "single-column": [single_column(rng) for _ in range(4)],
+        "two-column": [two_column(rng) for _ in range(4)],
+        "table-heavy": [table_heavy(rng) for _ in range(4)],
+        "60 pages (cap 20)": [single_column(rng, pages=60)],
+    }
+    print(f"{'corpus':<18}{'pdfplumber':>14}{'tiered':>12}{'speedup':>10}")
+    for name, docs in corpus.items():
+        legacy = _ms_per_doc(_legacy, docs)
+        tiered = _ms_per_doc(lambda d: pdf_extractor.extract_text(d, max_pages=20), docs)
+        print(f"{name:<18}{legacy:>11.1f} ms{tiered:>9.1f} ms{legacy / tiered:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
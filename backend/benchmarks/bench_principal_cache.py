@@ -0,0 +1,140 @@
+"""Requests/second and median latency on GET /api/v1/jobs/list, with the
+principal cache disabled (users.find_one on every request) and enabled.
+
+The app runs in-process over ASGI against a stub database. Like Motor, the
+stub runs every query on a worker thread and BSON-encodes the command and
+reply, then adds a fixed network delay, about that of a database in another
+availability zone; at loopback delays the in-process ASGI overhead swamps
+the lookup and both runs look alike. With no server-side cost counted, the
+numbers are a floor on what the cache saves.
+
+Run from ``backend/``:  python -m benchmarks.bench_principal_cache
+"""
+import asyncio
+import statistics
+import time
+from datetime import datetime
+
+import bson
+import httpx
+from bson import ObjectId
+
+from app import database
+from app.config import settings
+from app.main import app
+from app.services import auth
+
+REQUESTS = 2000
+CONCURRENCY = 8  # higher saturates the one in-process event loop and hides the lookup
+MONGO_RTT = 0.005  # seconds per stub query
+USERS = 50
+
+_USERS = {
+    str(oid): {
+        "_id": oid, "email": f"user{i}@example.com", "full_name": f"User {i}",
+        "role": "student", "is_active": True, "created_at": datetime.utcnow(),
+    }
+    for i, oid in enumerate(ObjectId() for _ in range(USERS))
+}
+_JOBS = [
+    {
+        "_id": ObjectId(), "title": f"Engineer {i}", "company": "Acme",
+        "description": "Build things", "required_skills": ["python"],
+        "recruiter_id": "r", "status": "active", "posted_at": datetime.utcnow(),
+    }
+    for i in range(20)
+]
+
+
+async def _round_trip(command: dict, reply):
+    """Client-side cost of one query: thread hop plus BSON both ways."""
+    def codec():
+        bson.decode(bson.encode(command))
+        return bson.decode(bson.encode({"cursor": {"firstBatch": reply}}))["cursor"]["firstBatch"]
+
+    result = await asyncio.get_running_loop().run_in_executor(None, codec)
+    await asyncio.sleep(MONGO_RTT)
+    return result
+
+
+class _Cursor:
+    def skip(self, n):
+        return self
+
+    def limit(self, n):
+        return self
+
+    def sort(self, *args):
+        return self
+
+    async def __aiter__(self):
+        for job in await _round_trip({"find": "jobs", "filter": {"status": "active"}}, _JOBS):
+            yield job
+
+
+class _Users:
+    lookups = 0
+
+    async def find_one(self, query):
+        _Users.lookups += 1
+        user = _USERS.get(str(query["_id"]))
+        found = await _round_trip({"find": "users", "filter": query}, [user] if user else [])
+        return found[0] if found else None
+
+
+class _Jobs:
+    def find(self, *args, **kwargs):
+        return _Cursor()
+
+
+class _StubDB:
+    users = _Users()
+    jobs = _Jobs()
+
+
+async def _run(label: str, tokens: list[str]):
+    _Users.lookups = 0
+    auth._principals.clear()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        sem = asyncio.Semaphore(CONCURRENCY)
+        latencies: list[float] = []
+
+        async def one(i: int):
+            async with sem:
+                begin = time.perf_counter()
+                r = await client.get(
+                    "/api/v1/jobs/list",
+                    headers={"Authorization": f"Bearer {tokens[i % len(tokens)]}"},
+                )
+                latencies.append((time.perf_counter() - begin) * 1000)
+                assert r.status_code == 200, r.text
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(REQUESTS)))
+        elapsed = time.perf_counter() - start
+    p50 = statistics.median(latencies)
+    print(
+        f"{label:<24} {REQUESTS / elapsed:7.0f} req/s   p50 {p50:6.2f} ms   "
+        f"users.find_one x{_Users.lookups}"
+    )
+
+
+async def main():
+    database.db = _StubDB()
+    tokens = [auth.create_access_token(auth.token_claims(u)) for u in _USERS.values()]
+    print(
+        f"{REQUESTS} requests, concurrency {CONCURRENCY}, {USERS} users, "
+        f"stub Mongo RTT {MONGO_RTT * 1000:.1f} ms"
+    )
+
+    await _run("(warm-up)", tokens)
+    ttl = settings.PRINCIPAL_CACHE_TTL_SECONDS
+    settings.PRINCIPAL_CACHE_TTL_SECONDS = 0
+    await _run("DB lookup per request", tokens)
+    settings.PRINCIPAL_CACHE_TTL_SECONDS = ttl
+    await _run("principal cache", tokens)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,45 @@
+"""Copy each resume's owner onto its existing ATS scores as ``user_id``.
+
+Scores written since user_id was denormalized already carry it; this fills
+in older ones so /ats/history (which now queries ats_scores by user_id
+alone) sees them. Safe to re-run: only scores without user_id are touched,
+one update_many per resume over the (resume_id, job_id) index. Scores
+whose resume has been deleted get no user_id, which keeps them out of
+history and the export; deleting a resume now removes its scores too.
+
+Run from ``backend/``:  python -m migrations.backfill_score_user_id
+"""
+import asyncio
+
+from pymongo import UpdateMany
+
+from app.database import close_db, connect_db, get_db
+
+BATCH = 500
+
+
+async def main():
+    await connect_db()
+    db = get_db()
+    ops, updated, resumes = [], 0, 0
+    try:
+        async for r in db.resumes.find({}, {"user_id": 1}):
+            ops.append(UpdateMany(
+                {"resume_id": str(r["_id"]), "user_id": {"$exists": False}},
+                {"$set": {"user_id": r["user_id"]}},
+            ))
+            resumes += 1
+            if len(ops) == BATCH:
+                updated += (await db.ats_scores.bulk_write(ops, ordered=False)).modified_count
+                ops = []
+        if ops:
+            updated += (await db.ats_scores.bulk_write(ops, ordered=False)).modified_count
+        remaining = await db.ats_scores.count_documents({"user_id": {"$exists": False}})
+        print(f"Checked {resumes} resumes, set user_id on {updated} scores")
+        print(f"{remaining} scores without user_id remain (their resumes no longer exist)")
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
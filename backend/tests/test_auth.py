@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.services import auth
+
+
+class FakeUsers:
+    def __init__(self, *docs):
+        self.docs = {doc["_id"]: doc for doc in docs}
+
+    async def find_one(self, query):
+        doc = self.docs.get(query["_id"])
+        return dict(doc) if doc else None
+
+
+@pytest.fixture
+def user(monkeypatch):
+    doc = {"_id": ObjectId(), "role": "recruiter", "is_active": True}
+    monkeypatch.setattr(auth, "get_db", lambda: SimpleNamespace(users=FakeUsers(doc)))
+    monkeypatch.setattr(auth, "_principals", auth.OrderedDict())
+    return doc
+
+
+def bearer(user: dict) -> HTTPAuthorizationCredentials:
+    token = auth.create_access_token(auth.token_claims(user))
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+@pytest.mark.asyncio
+async def test_token_issued_before_deactivation_is_rejected(user):
+    credentials = bearer(user)
+    assert (await auth.get_token_principal(credentials))["is_active"] is True
+
+    user["is_active"] = False
+    auth.invalidate_principal(str(user["_id"]))
+    with pytest.raises(HTTPException) as exc:
+        await auth.get_token_principal(credentials)
+    assert exc.value.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_role_comes_from_the_user_not_the_token(user):
+    credentials = bearer(user)
+    user["role"] = "student"
+    auth.invalidate_principal(str(user["_id"]))
+    assert (await auth.get_token_principal(credentials))["role"] == "student"
@@ -0,0 +1,26 @@
+import pytest
+
+from app.services.resume_parser import extract_skills
+from app.services.skill_matcher import SkillMatcher
+
+
+@pytest.mark.parametrize(
+    "text, skill",
+    [("GİT", "git"), ("Lınux", "linux"), ("ruſt", "rust")],
+)
+def test_case_variants_that_lower_does_not_fold(text, skill):
+    # The regex matches these case-insensitively although str.lower() maps
+    # them to a different string than the table key
+    matcher = SkillMatcher(["git", "linux", "rust"])
+    assert matcher.skills(f"Worked with {text} daily") == [skill]
+
+
+def test_parse_path_does_not_raise_on_case_variants():
+    assert extract_skills("GİT, Lınux and ruſt") == ["git", "linux", "rust"]
+
+
+def test_aliases_resolve_to_canonical_skill():
+    matcher = SkillMatcher(["JavaScript"], {"js": "javascript"})
+    found = matcher.find("JS and javascript")
+    assert list(found) == ["JavaScript"]
+    assert found["JavaScript"].count == 2
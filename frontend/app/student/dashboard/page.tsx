@@ -4,7 +4,7 @@ import { useEffect, useState } from "react";
 import { useRouter } from "next/navigation";
 import { useAuth } from "@/context/AuthContext";
 import Navbar from "@/components/Navbar";
-import { resumeApi, Resume, atsApi } from "@/services/api";
+import { resumeApi, Resume, atsApi, ScoreHistorySummary } from "@/services/api";
 import { FileText, BarChart3, Upload, ExternalLink } from "lucide-react";
 import Link from "next/link";
 
@@ -12,9 +12,7 @@ export default function StudentDashboard() {
   const { user, loading } = useAuth();
   const router = useRouter();
   const [resumes, setResumes] = useState<Resume[]>([]);
-  const [scoreHistory, setScoreHistory] = useState<
-    { id: string; resume_id: string; job_id: string; overall_score: number; created_at: string }[]
-  >([]);
+  const [scoreSummary, setScoreSummary] = useState<ScoreHistorySummary | null>(null);
   const [fetching, setFetching] = useState(true);
 
   useEffect(() => {
@@ -24,18 +22,17 @@ export default function StudentDashboard() {
 
   useEffect(() => {
     if (!user) return;
-    Promise.all([resumeApi.list(), atsApi.history()]).then(([rRes, sRes]) => {
+    Promise.all([resumeApi.list(), atsApi.historySummary()]).then(([rRes, sRes]) => {
       setResumes(rRes.data);
-      setScoreHistory(sRes.data);
+      setScoreSummary(sRes.data);
     }).finally(() => setFetching(false));
   }, [user]);
 
   if (loading || !user) return null;
 
   const avgScore =
-    scoreHistory.length
-      ? Math.round(scoreHistory.reduce((a, s) => a + s.overall_score, 0) / scoreHistory.length)
-      : null;
+    scoreSummary?.average_score != null ? Math.round(scoreSummary.average_score) : null;
+  const recentScores = scoreSummary?.recent ?? [];
 
   return (
     <div className="min-h-screen bg-zinc-50">
@@ -52,7 +49,7 @@ export default function StudentDashboard() {
         <div className="mb-8 grid grid-cols-2 gap-4 sm:grid-cols-3">
           {[
             { label: "Resumes uploaded", value: resumes.length, icon: <FileText className="h-5 w-5 text-indigo-500" /> },
-            { label: "ATS scores run", value: scoreHistory.length, icon: <BarChart3 className="h-5 w-5 text-green-500" /> },
+            { label: "ATS scores run", value: scoreSummary?.count ?? 0, icon: <BarChart3 className="h-5 w-5 text-green-500" /> },
             { label: "Avg. ATS score", value: avgScore !== null ? `${avgScore}/100` : "—", icon: <BarChart3 className="h-5 w-5 text-amber-500" /> },
           ].map((s) => (
             <div key={s.label} className="rounded-2xl border bg-white p-5 shadow-sm">
@@ -121,11 +118,11 @@ export default function StudentDashboard() {
         </section>
 
         {/* Score history */}
-        {scoreHistory.length > 0 && (
+        {recentScores.length > 0 && (
           <section>
             <h2 className="mb-4 font-semibold text-zinc-900">Recent ATS Scores</h2>
             <div className="space-y-2">
-              {scoreHistory.slice(0, 5).map((s) => (
+              {recentScores.map((s) => (
                 <div
                   key={s.id}
                   className="flex items-center justify-between rounded-xl border bg-white px-4 py-3"
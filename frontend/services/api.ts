@@ -156,9 +156,32 @@ export interface ATSScore {
   created_at: string;
 }
 
+export interface ScoreHistoryItem {
+  id: string;
+  resume_id: string;
+  job_id: string;
+  overall_score: number;
+  degraded: boolean;
+  created_at: string;
+}
+
+export interface ScoreHistoryPage {
+  items: ScoreHistoryItem[];
+  next_cursor: string | null;
+}
+
+export interface ScoreHistorySummary {
+  count: number;
+  average_score: number | null;
+  recent: ScoreHistoryItem[];
+}
+
 export const atsApi = {
   score: (resume_id: string, job_id: string) =>
     api.post<ATSScore>("/api/v1/ats/score", { resume_id, job_id }),
   get: (id: string) => api.get<ATSScore>(`/api/v1/ats/score/${id}`),
-  history: () => api.get<{ id: string; resume_id: string; job_id: string; overall_score: number; created_at: string }[]>("/api/v1/ats/history"),
+  history: (cursor?: string, limit = 200) =>
+    api.get<ScoreHistoryPage>("/api/v1/ats/history", { params: { cursor, limit } }),
+  // Count, average and latest scores in one request
+  historySummary: () => api.get<ScoreHistorySummary>("/api/v1/ats/history/summary"),
 };